@@ -3,14 +3,85 @@ AI-Powered File Categorizer - Uses LLM to intelligently categorize files
 Supports both OpenAI and free Hugging Face models
 """
 import os
+import re
 import json
+import asyncio
+import hashlib
+import shelve
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 from file_scanner import FileInfo
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: the cache file isn't locked
+    fcntl = None
+
 load_dotenv()
 
+# JSON extraction from free-form model output
+_JSON_DECODER = json.JSONDecoder()
+_CODE_FENCE = re.compile(r'^```(?:json)?\s*|```\s*$', re.IGNORECASE | re.MULTILINE)
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+# JSON encode/decode with orjson when installed (same output as the json fallback)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumpb(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (2-space indent or compact)"""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False).encode()
+
+
+def _json_dumps(obj, indent: bool = False, sort_keys: bool = False) -> str:
+    """Serialize obj to a JSON string"""
+    return _json_dumpb(obj, indent, sort_keys).decode()
+
+
+# Persistent cache of LLM categorizations, so re-scans skip files seen before
+CACHE_DIR = Path.home() / ".cache" / "agentic_organizer"
+# Cache entries are dropped after CACHE_MAX_AGE seconds, oldest first past CACHE_MAX_ENTRIES
+# (checked at most every CACHE_PRUNE_INTERVAL seconds, when the cache is opened)
+CACHE_MAX_AGE = 90 * 24 * 3600
+CACHE_MAX_ENTRIES = 100_000
+CACHE_PRUNE_INTERVAL = 24 * 3600
+_CACHE_PRUNED_AT_KEY = "__pruned_at__"
+
+# Extension -> category for rule-based categorization
+EXT_TO_CATEGORY = {
+    **dict.fromkeys(['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt'], "Documents"),
+    **dict.fromkeys(['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp'], "Images"),
+    **dict.fromkeys(['.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv'], "Videos"),
+    **dict.fromkeys(['.mp3', '.wav', '.flac', '.aac', '.ogg'], "Audio"),
+    **dict.fromkeys(['.zip', '.rar', '.7z', '.tar', '.gz'], "Archives"),
+    **dict.fromkeys(['.py', '.js', '.ts', '.java', '.cpp', '.c', '.html', '.css', '.json', '.xml'], "Code"),
+    **dict.fromkeys(['.xls', '.xlsx', '.csv', '.ods'], "Spreadsheets"),
+    **dict.fromkeys(['.ppt', '.pptx', '.odp'], "Presentations"),
+    **dict.fromkeys(['.exe', '.msi', '.dmg', '.pkg', '.deb', '.rpm'], "Installers"),
+}
+
+# MIME top-level type -> category, for extensions not listed above
+MIME_PREFIX_TO_CATEGORY = {
+    "image": "Images",
+    "video": "Videos",
+    "audio": "Audio",
+}
+
 
 class FileCategorizer:
     """Uses LLM to categorize files intelligently"""
@@ -22,6 +93,31 @@ class FileCategorizer:
         "Presentations", "PDFs", "Installers", "Fonts", "Other"
     ]
     
+    # Fields shared by every rule-based categorization
+    FALLBACK_RESULT = {
+        "category": "Other",
+        "subcategory": None,
+        "project": None,
+        "suggested_name": None,
+        "confidence": 0.7,
+        "reason": ""
+    }
+    
+    # Local model prompt bucket limit and completion cap (tokens)
+    HF_MAX_INPUT_TOKENS = 2048
+    HF_MAX_NEW_TOKENS = 2000
+    
+    # Marks where the file descriptions go when splitting the local prompt into cached parts
+    FILES_PLACEHOLDER = "<<FILES_TO_CATEGORIZE>>"
+    
+    # Batches sent to the LLM at once
+    OPENAI_CONCURRENCY = 16
+    HF_API_CONCURRENCY = 8
+    HF_LOCAL_BATCH_PROMPTS = 4
+    # vLLM batches continuously, so it can take many more prompts per round
+    VLLM_BATCH_PROMPTS = 32
+    VLLM_MAX_MODEL_LEN = 4096
+    
     def __init__(
         self,
         provider: str = "auto",
@@ -39,8 +135,21 @@ class FileCategorizer:
         self.provider = provider
         self.model_name = model_name
         self.client = None
+        self._client_loop = None
+        self._openai_semaphore = None
         self.hf_model = None
         self.hf_tokenizer = None
+        self.vllm = None
+        self._hf_executor = None
+        self.use_static_cache = False
+        self._prompt_cache = None
+        self._brace_counts = None
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        self._cache_lock_file = None
+        
+        self.preferences: Dict = {}
+        self._load_preferences()
         
         # Auto-detect provider
         if provider == "auto":
@@ -55,9 +164,6 @@ class FileCategorizer:
             # Fallback to rule-based only
             print("Warning: No LLM provider configured. Using rule-based categorization only.")
             self.provider = "rule-based"
-        
-        self.preferences: Dict = {}
-        self._load_preferences()
     
     def _detect_provider(self) -> str:
         """Auto-detect which provider to use based on available credentials"""
@@ -76,15 +182,14 @@ class FileCategorizer:
                 return "rule-based"
     
     def _init_openai(self, api_key: Optional[str] = None):
-        """Initialize OpenAI client"""
-        try:
-            from openai import OpenAI
-            self.api_key = api_key or os.getenv("OPENAI_API_KEY")
-            if not self.api_key:
-                raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY in .env file")
-            self.client = OpenAI(api_key=self.api_key)
-        except ImportError:
+        """Initialize OpenAI client settings (the AsyncOpenAI client itself is created per run)"""
+        import importlib.util
+        
+        if importlib.util.find_spec("openai") is None:
             raise ImportError("openai package not installed. Run: pip install openai")
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY in .env file")
     
     def _init_huggingface(self, model_name: Optional[str] = None):
         """Initialize Hugging Face model (local or API)"""
@@ -106,10 +211,16 @@ class FileCategorizer:
         else:
             # Use local model
             self.use_inference_api = False
+            if self._init_vllm():
+                return
             try:
                 from transformers import AutoModelForCausalLM, AutoTokenizer
                 import torch
                 
+                # All local inference runs on this one thread, so the CUDA graphs recorded
+                # while warming up the compiled model (kept per thread) are reused by every run
+                self._hf_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hf-local")
+                
                 print(f"Loading Hugging Face model: {self.model_name}")
                 print("(This may take a moment on first run as the model downloads...)")
                 
@@ -118,6 +229,8 @@ class FileCategorizer:
                 # Set pad token if not set
                 if self.hf_tokenizer.pad_token is None:
                     self.hf_tokenizer.pad_token = self.hf_tokenizer.eos_token
+                # Decoder-only models generate from the right edge of batched prompts
+                self.hf_tokenizer.padding_side = "left"
                 
                 # Load model with appropriate settings
                 # Check for Apple Silicon (MPS) or CUDA
@@ -127,16 +240,22 @@ class FileCategorizer:
                 model_kwargs = {}
                 
                 if use_cuda:
-                    # NVIDIA GPU
-                    model_kwargs["torch_dtype"] = torch.float16
+                    # NVIDIA GPU - device_map places the (quantized) weights
                     model_kwargs["device_map"] = "auto"
+                    quantization_config = self._build_quantization_config()
+                    if quantization_config is not None:
+                        model_kwargs["quantization_config"] = quantization_config
+                    elif torch.cuda.is_bf16_supported():
+                        model_kwargs["torch_dtype"] = torch.bfloat16
+                    else:
+                        model_kwargs["torch_dtype"] = torch.float16
                 elif use_mps:
                     # Apple Silicon (M1/M2/M3)
-                    model_kwargs["torch_dtype"] = torch.float16
                     # MPS device will be set after loading
+                    model_kwargs["torch_dtype"] = torch.bfloat16 if self._supports_bf16("mps") else torch.float16
                 else:
                     # CPU only
-                    model_kwargs["torch_dtype"] = torch.float32
+                    model_kwargs["torch_dtype"] = torch.bfloat16 if self._supports_bf16("cpu") else torch.float32
                 
                 self.hf_model = AutoModelForCausalLM.from_pretrained(
                     self.model_name,
@@ -146,13 +265,18 @@ class FileCategorizer:
                 # Move to appropriate device
                 if use_cuda:
                     # Already on GPU via device_map
-                    pass
+                    if "quantization_config" in model_kwargs:
+                        print(f"Using {self.quantization} quantized weights (bitsandbytes)")
                 elif use_mps:
                     self.hf_model = self.hf_model.to("mps")
                     print("Using Apple Silicon (Metal) acceleration")
                 else:
                     self.hf_model = self.hf_model.to("cpu")
                 
+                # CUDA graphs only pay off on NVIDIA GPUs
+                if use_cuda:
+                    self._compile_model()
+                
                 print("Model loaded successfully!")
             except ImportError:
                 print("Warning: transformers not installed. Install with: pip install transformers torch")
@@ -163,13 +287,151 @@ class FileCategorizer:
                 print("Falling back to rule-based categorization...")
                 self.provider = "rule-based"
     
+    def _init_vllm(self) -> bool:
+        """Load the local model with vLLM (paged KV cache, CUDA graphs, prefix caching)
+        
+        Returns False if vLLM isn't installed or can't load the model, so the caller
+        falls back to transformers. Set HUGGINGFACE_BACKEND=transformers to skip vLLM.
+        """
+        if os.getenv("HUGGINGFACE_BACKEND", "auto").lower() == "transformers":
+            return False
+        try:
+            from vllm import LLM, SamplingParams
+        except ImportError:
+            return False
+        
+        try:
+            print(f"Loading Hugging Face model with vLLM: {self.model_name}")
+            # VLLM_QUANTIZATION: e.g. "awq" for AWQ checkpoints or "fp8" on Ada/Hopper GPUs
+            self.vllm = LLM(
+                model=self.model_name,
+                dtype="auto",
+                quantization=os.getenv("VLLM_QUANTIZATION") or None,
+                max_model_len=self.VLLM_MAX_MODEL_LEN,
+                enable_prefix_caching=True  # the instructions head is shared by every prompt
+            )
+            self.hf_tokenizer = self.vllm.get_tokenizer()
+        except Exception as e:
+            print(f"Warning: vLLM could not load the model ({e}), using transformers...")
+            self.vllm = None
+            return False
+        
+        sampling_kwargs = {"temperature": 0.0, "max_tokens": self.HF_MAX_NEW_TOKENS}
+        try:
+            from vllm.sampling_params import GuidedDecodingParams
+            
+            # Constrain output to a JSON object mapping file names to categorizations
+            sampling_kwargs["guided_decoding"] = GuidedDecodingParams(json={
+                "type": "object",
+                "additionalProperties": {
+                    "type": "object",
+                    "properties": {
+                        "category": {"type": "string", "enum": self.DEFAULT_CATEGORIES},
+                        "subcategory": {"type": ["string", "null"]},
+                        "project": {"type": ["string", "null"]},
+                        "suggested_name": {"type": ["string", "null"]},
+                        "confidence": {"type": "number"},
+                        "reason": {"type": "string"}
+                    },
+                    "required": ["category"]
+                }
+            })
+        except ImportError:
+            pass
+        self.vllm_sampling_params = SamplingParams(**sampling_kwargs)
+        
+        print("Model loaded successfully (vLLM)!")
+        return True
+    
+    def _build_quantization_config(self):
+        """Build a bitsandbytes quantization config for CUDA, or None to load unquantized
+        
+        Controlled by HUGGINGFACE_QUANTIZATION: "4bit" (default), "8bit" or "none".
+        """
+        import importlib.util
+        import torch
+        
+        self.quantization = os.getenv("HUGGINGFACE_QUANTIZATION", "4bit").lower()
+        if self.quantization == "none":
+            return None
+        
+        if importlib.util.find_spec("bitsandbytes") is None:
+            print("Warning: bitsandbytes not installed. Install with: pip install bitsandbytes")
+            print("Loading model without quantization...")
+            self.quantization = "none"
+            return None
+        
+        from transformers import BitsAndBytesConfig
+        
+        if self.quantization == "4bit":
+            # NF4 weights, dequantized to bfloat16 for the matmuls
+            return BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16,
+                bnb_4bit_use_double_quant=True
+            )
+        
+        if self.quantization == "8bit":
+            # LLM.int8(): outlier features above the threshold stay in fp16
+            return BitsAndBytesConfig(load_in_8bit=True, llm_int8_threshold=6.0)
+        
+        print(f"Warning: Unknown HUGGINGFACE_QUANTIZATION '{self.quantization}', loading without quantization...")
+        self.quantization = "none"
+        return None
+    
+    def _compile_model(self):
+        """Compile the model forward pass and warm it up so the first batch doesn't pay for compilation
+        
+        The warm-up goes through generate() with the static KV cache on the local inference
+        thread, like real calls, for a full round of the smallest prompt bucket (prefill and one
+        decode step). Larger buckets compile the first time a prompt needs them.
+        """
+        import torch
+        
+        eager_forward = self.hf_model.forward
+        try:
+            print("Compiling model (one-time warm-up)...")
+            self.hf_model.forward = torch.compile(eager_forward, mode="reduce-overhead", dynamic=False)
+            self.use_static_cache = True
+            
+            def warm_up():
+                inputs, generate_kwargs = self._build_local_inputs([[]] * self.HF_LOCAL_BATCH_PROMPTS)
+                self._generate_local(inputs, generate_kwargs, max_new_tokens=2)
+            
+            self._hf_executor.submit(warm_up).result()
+        except Exception as e:
+            print(f"Warning: torch.compile failed ({e}), using eager mode")
+            self.hf_model.forward = eager_forward
+            self.use_static_cache = False
+            self._prompt_cache = None
+    
+    def _bucket_length(self, length: int) -> int:
+        """Round a prompt length up to a bucket so compiled shapes get reused
+        
+        Powers of two up to HF_MAX_INPUT_TOKENS, then multiples of 64 for longer prompts.
+        """
+        if length > self.HF_MAX_INPUT_TOKENS:
+            return -(-length // 64) * 64
+        return min(max(64, 1 << (length - 1).bit_length()), self.HF_MAX_INPUT_TOKENS)
+    
+    def _supports_bf16(self, device: str) -> bool:
+        """Check whether bfloat16 tensors can be used on the given device"""
+        import torch
+        
+        try:
+            torch.ones(1, dtype=torch.bfloat16, device=device)
+            return True
+        except (RuntimeError, TypeError):
+            return False
+    
     def _load_preferences(self):
         """Load user preferences from file"""
         prefs_file = Path("preferences.json")
         if prefs_file.exists():
             try:
-                with open(prefs_file, 'r') as f:
-                    self.preferences = json.load(f)
+                with open(prefs_file, 'rb') as f:
+                    self.preferences = _json_loads(f.read())
             except:
                 self.preferences = {}
         else:
@@ -178,42 +440,271 @@ class FileCategorizer:
     def _save_preferences(self):
         """Save user preferences to file"""
         prefs_file = Path("preferences.json")
-        with open(prefs_file, 'w') as f:
-            json.dump(self.preferences, f, indent=2)
+        with open(prefs_file, 'wb') as f:
+            f.write(_json_dumpb(self.preferences, indent=True))
     
     def categorize_files(self, files: List[FileInfo], batch_size: int = 20, progress_callback=None) -> Dict[FileInfo, Dict]:
         """Categorize a list of files using LLM
         
+        Synchronous wrapper around categorize_files_async (must not be called from a running event loop).
+        
         Args:
             files: List of files to categorize
             batch_size: Number of files to process per batch
             progress_callback: Optional callback function(current, total, current_file) called after each batch
         """
+        return asyncio.run(self.categorize_files_async(files, batch_size, progress_callback))
+    
+    async def categorize_files_async(self, files: List[FileInfo], batch_size: int = 20, progress_callback=None) -> Dict[FileInfo, Dict]:
+        """Categorize a list of files using LLM (see categorize_files)"""
         results = {}
+        try:
+            async for round_results in self._categorize_rounds(files, batch_size, progress_callback):
+                results.update(round_results)
+        finally:
+            await self._close_openai_client()
+            self._close_cache()
+        return results
+    
+    def categorize_iter(self, files: List[FileInfo], batch_size: int = 20, progress_callback=None) -> Iterator[Tuple[FileInfo, Dict]]:
+        """Yield (file, categorization) pairs as soon as each round of batches is categorized
+        
+        Lets callers act on early results (e.g. move files) while later batches are still with the LLM.
+        """
+        loop = asyncio.new_event_loop()
+        rounds = self._categorize_rounds(files, batch_size, progress_callback)
+        try:
+            while True:
+                try:
+                    round_results = loop.run_until_complete(rounds.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield from round_results.items()
+        finally:
+            loop.run_until_complete(rounds.aclose())
+            loop.run_until_complete(self._close_openai_client())
+            loop.close()
+            self._close_cache()
+    
+    async def _categorize_rounds(self, files: List[FileInfo], batch_size: int, progress_callback) -> AsyncIterator[Dict[FileInfo, Dict]]:
+        """Categorize files round by round, yielding each round's results (cached ones first)"""
         total_files = len(files)
         
+        # Files categorized before (same name, size and type) don't go back to the LLM
+        cached_results = {}
+        pending = []
+        for file in files:
+            cached = self._get_cached_categorization(file)
+            if cached is not None:
+                cached_results[file] = cached
+            else:
+                pending.append(file)
+        if cached_results:
+            yield cached_results
+        
         # Process in batches to avoid token limits
-        for i in range(0, total_files, batch_size):
-            batch = files[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (total_files + batch_size - 1) // batch_size
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        total_batches = len(batches)
+        batches_per_round = self._batches_per_round()
+        done = len(cached_results)
+        
+        # Several batches go to the LLM together (one padded generate() or concurrent API requests)
+        for i in range(0, total_batches, batches_per_round):
+            round_batches = batches[i:i + batches_per_round]
+            first_batch, last_batch = i + 1, i + len(round_batches)
             
-            # Update progress before processing batch
+            # Update progress before processing batches
             if progress_callback:
-                current_file = batch[0].name if batch else ""
-                progress_callback(i, total_files, f"Processing batch {batch_num}/{total_batches}: {current_file}")
+                current_file = round_batches[0][0].name
+                progress_callback(done, total_files, f"Processing batches {first_batch}-{last_batch}/{total_batches}: {current_file}")
             
-            batch_results = self._categorize_batch(batch)
-            results.update(batch_results)
+            batch_results = await self._categorize_batches(round_batches)
+            done += sum(len(batch) for batch in round_batches)
+            self._sync_cache()
             
-            # Update progress after processing batch
+            # Update progress after processing batches
             if progress_callback:
-                progress_callback(min(i + batch_size, total_files), total_files, f"Completed batch {batch_num}/{total_batches}")
+                progress_callback(done, total_files, f"Completed batch {last_batch}/{total_batches}")
+            
+            yield batch_results
+    
+    def _cache_key(self, file: FileInfo) -> str:
+        """Cache key for a file's categorization - changes with the model and learned preferences"""
+        key_data = [
+            self.provider,
+            self.model_name,
+            self.preferences.get("category_rules"),
+            file.name,
+            file.size,
+            file.extension,
+            file.mime_type
+        ]
+        return hashlib.sha256(_json_dumpb(key_data, sort_keys=True)).hexdigest()
+    
+    def _open_cache(self):
+        """Open the on-disk categorization cache for a run (LLM providers only)
         
-        return results
+        The file is locked while open, so only one process (e.g. the web app or a scheduled
+        CLI run) uses it at a time; the others cache for their current run only.
+        """
+        if self._cache is not None or self.provider not in ("openai", "huggingface"):
+            return self._cache
+        
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self._cache_lock_file = self._lock_cache_file()
+            if self._cache_lock_file is None:
+                print("Note: Categorization cache is in use by another process, caching for this run only")
+                self._cache = {}
+            else:
+                self._cache = shelve.open(str(CACHE_DIR / "catcache"))
+                self._prune_cache(self._cache)
+        except Exception as e:
+            print(f"Warning: Could not open categorization cache ({e}), caching for this run only")
+            self._release_cache()
+            self._cache = {}
+        return self._cache
+    
+    def _lock_cache_file(self):
+        """Lock the cache's sidecar lock file, or return None if another process holds it"""
+        lock_file = open(CACHE_DIR / "catcache.lock", "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                return None
+        return lock_file
+    
+    def _prune_cache(self, cache: shelve.Shelf):
+        """Drop expired entries, then the oldest ones past CACHE_MAX_ENTRIES"""
+        now = time.time()
+        if now - cache.get(_CACHE_PRUNED_AT_KEY, 0) < CACHE_PRUNE_INTERVAL:
+            return
+        
+        cutoff = now - CACHE_MAX_AGE
+        stored_at = {}
+        stale = []
+        for key in list(cache.keys()):
+            if key == _CACHE_PRUNED_AT_KEY:
+                continue
+            entry = cache.get(key)
+            # Entries are (time stored, categorization); anything else is from an older version
+            if isinstance(entry, tuple) and entry[0] >= cutoff:
+                stored_at[key] = entry[0]
+            else:
+                stale.append(key)
+        if len(stored_at) > CACHE_MAX_ENTRIES:
+            stale.extend(sorted(stored_at, key=stored_at.get)[:len(stored_at) - CACHE_MAX_ENTRIES])
+        
+        for key in stale:
+            del cache[key]
+        cache[_CACHE_PRUNED_AT_KEY] = now
+    
+    def _release_cache(self):
+        """Close the cache file and release its lock (call with _cache_lock held)"""
+        if isinstance(self._cache, shelve.Shelf):
+            self._cache.close()
+        self._cache = None
+        if self._cache_lock_file is not None:
+            # Closing the file drops the flock
+            self._cache_lock_file.close()
+            self._cache_lock_file = None
+    
+    def _close_cache(self):
+        """Close the categorization cache at the end of a run, so other processes can use it"""
+        with self._cache_lock:
+            self._release_cache()
+    
+    def _get_cached_categorization(self, file: FileInfo) -> Optional[Dict]:
+        """Look up a previous LLM categorization of a file"""
+        with self._cache_lock:
+            cache = self._open_cache()
+            if cache is None:
+                return None
+            entry = cache.get(self._cache_key(file))
+            return entry[1] if isinstance(entry, tuple) else None
     
-    def _categorize_batch(self, files: List[FileInfo]) -> Dict[FileInfo, Dict]:
-        """Categorize a batch of files"""
+    def _cache_categorization(self, file: FileInfo, cat_data: Dict):
+        """Remember an LLM categorization of a file"""
+        with self._cache_lock:
+            cache = self._open_cache()
+            if cache is not None:
+                cache[self._cache_key(file)] = (time.time(), cat_data)
+    
+    def _sync_cache(self):
+        """Flush the categorization cache to disk"""
+        with self._cache_lock:
+            if isinstance(self._cache, shelve.Shelf):
+                self._cache.sync()
+    
+    def _batches_per_round(self) -> int:
+        """Number of batches sent to the LLM at once"""
+        if self.provider == "openai":
+            return self.OPENAI_CONCURRENCY
+        if self.provider == "huggingface":
+            if self.use_inference_api:
+                return self.HF_API_CONCURRENCY
+            return self.VLLM_BATCH_PROMPTS if self.vllm is not None else self.HF_LOCAL_BATCH_PROMPTS
+        return 1
+    
+    async def _categorize_batches(self, batches: List[List[FileInfo]]) -> Dict[FileInfo, Dict]:
+        """Categorize several batches of files, one prompt per batch"""
+        if self.provider not in ("openai", "huggingface"):
+            # Rule-based fallback
+            return {file: self._fallback_categorize(file) for files in batches for file in files}
+        
+        try:
+            if self.provider == "openai":
+                results = await self._categorize_with_openai([self._build_prompt(files) for files in batches])
+            elif self._hf_executor is not None:
+                # Model inference blocks, so keep it off the event loop (on the local inference thread)
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._hf_executor, self._categorize_with_huggingface, batches
+                )
+            else:
+                # Model inference blocks, so keep it off the event loop
+                results = await asyncio.to_thread(self._categorize_with_huggingface, batches)
+        except Exception as e:
+            results = [e] * len(batches)
+        
+        categorized = {}
+        for files, result in zip(batches, results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                categorized.update(self._map_results(files, result))
+            except Exception as e:
+                print(f"Error in LLM categorization: {e}")
+                # Fallback to rule-based categorization
+                for file in files:
+                    categorized[file] = self._fallback_categorize(file)
+        
+        return categorized
+    
+    def _map_results(self, files: List[FileInfo], result: Dict) -> Dict[FileInfo, Dict]:
+        """Map an LLM result (keyed by file name) back to FileInfo objects"""
+        categorized = {}
+        for file in files:
+            if file.name in result:
+                cat_data = result[file.name]
+                # Normalize the categorization data (handle arrays, etc.)
+                cat_data = self._normalize_categorization(cat_data)
+                categorized[file] = cat_data
+                self._cache_categorization(file, cat_data)
+            else:
+                # Fallback categorization
+                categorized[file] = self._fallback_categorize(file)
+        
+        return categorized
+    
+    def _build_prompt(self, files: List[FileInfo]) -> str:
+        """Build the categorization prompt for a batch of files"""
+        head, tail = self._prompt_parts()
+        return head + self._describe_files(files) + tail
+    
+    def _describe_files(self, files: List[FileInfo]) -> str:
+        """JSON description of a batch of files - the only per-batch part of the prompt"""
         # Prepare file information for LLM
         file_descriptions = []
         for file in files:
@@ -226,12 +717,17 @@ class FileCategorizer:
             }
             file_descriptions.append(desc)
         
+        return _json_dumps(file_descriptions, indent=True)
+    
+    def _prompt_parts(self) -> Tuple[str, str]:
+        """Prompt text before and after the file descriptions (only the head depends on preferences)"""
         # Build prompt with preferences
         preferences_text = ""
         if self.preferences.get("category_rules"):
-            preferences_text = f"\n\nUser preferences:\n{json.dumps(self.preferences['category_rules'], indent=2)}"
+            preferences_text = f"\n\nUser preferences:\n{_json_dumps(self.preferences['category_rules'], indent=True)}"
         
-        prompt = f"""You are a file organization assistant. Categorize the following files into appropriate categories.
+        # Everything except the file list comes first, so providers can reuse the cached prompt prefix
+        head = f"""You are a file organization assistant. Categorize the following files into appropriate categories.
 
 Available categories: {', '.join(self.DEFAULT_CATEGORIES)}
 
@@ -241,45 +737,16 @@ For each file, provide:
 3. project: If the file belongs to a specific project, identify it
 4. suggested_name: A cleaner, more descriptive name if the current name is unclear
 5. confidence: Your confidence level (0.0 to 1.0)
-6. reason: Brief explanation of your categorization
+6. reason: Brief explanation of your categorization{preferences_text}
 
 Files to categorize:
-{json.dumps(file_descriptions, indent=2)}
-{preferences_text}
+"""
+        tail = """
 
 Return a JSON object where keys are file names and values are categorization objects with the fields above.
 """
         
-        try:
-            if self.provider == "openai":
-                result = self._categorize_with_openai(prompt)
-            elif self.provider == "huggingface":
-                result = self._categorize_with_huggingface(prompt)
-            else:
-                # Rule-based fallback
-                return {file: self._fallback_categorize(file) for file in files}
-            
-            # Map results back to FileInfo objects
-            categorized = {}
-            for file in files:
-                if file.name in result:
-                    cat_data = result[file.name]
-                    # Normalize the categorization data (handle arrays, etc.)
-                    cat_data = self._normalize_categorization(cat_data)
-                    categorized[file] = cat_data
-                else:
-                    # Fallback categorization
-                    categorized[file] = self._fallback_categorize(file)
-            
-            return categorized
-            
-        except Exception as e:
-            print(f"Error in LLM categorization: {e}")
-            # Fallback to rule-based categorization
-            categorized = {}
-            for file in files:
-                categorized[file] = self._fallback_categorize(file)
-            return categorized
+        return head, tail
     
     def _normalize_categorization(self, cat_data: Dict) -> Dict:
         """Normalize categorization data from LLM (handle arrays, etc.)"""
@@ -301,30 +768,81 @@ Return a JSON object where keys are file names and values are categorization obj
         
         return cat_data
     
-    def _categorize_with_openai(self, prompt: str) -> Dict:
-        """Categorize using OpenAI API"""
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a helpful file organization assistant. Always respond with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
-        return json.loads(response.choices[0].message.content)
+    def _get_openai_client(self):
+        """AsyncOpenAI client shared by all requests of a run
+        
+        Its connection pool is bound to the running event loop, so each run closes it when done
+        (see _close_openai_client) and the next run creates a new one.
+        """
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._client_loop is not loop:
+            import httpx
+            from openai import AsyncOpenAI
+            
+            self.client = AsyncOpenAI(
+                api_key=self.api_key,
+                max_retries=3,
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+            self._client_loop = loop
+            self._openai_semaphore = asyncio.Semaphore(self.OPENAI_CONCURRENCY)
+        return self.client
+    
+    async def _close_openai_client(self):
+        """Close the run's AsyncOpenAI client, if one was created, before its event loop goes away"""
+        client, self.client = self.client, None
+        self._client_loop = None
+        self._openai_semaphore = None
+        if client is not None:
+            await client.close()
     
-    def _categorize_with_huggingface(self, prompt: str) -> Dict:
-        """Categorize using Hugging Face (local or Inference API)"""
+    async def _categorize_with_openai(self, prompts: List[str]) -> List:
+        """Categorize using OpenAI API, sending all prompts concurrently
+        
+        Returns one parsed result (or the exception raised) per prompt.
+        """
+        client = self._get_openai_client()
+        
+        async def run_one(prompt: str) -> Dict:
+            # The semaphore keeps us under the account's rate limits
+            async with self._openai_semaphore:
+                response = await client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[
+                        {"role": "system", "content": "You are a helpful file organization assistant. Always respond with valid JSON."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.3,
+                    response_format={"type": "json_object"}
+                )
+            return _json_loads(response.choices[0].message.content)
+        
+        return await asyncio.gather(*(run_one(p) for p in prompts), return_exceptions=True)
+    
+    def _categorize_with_huggingface(self, batches: List[List[FileInfo]]) -> List:
+        """Categorize using Hugging Face (local or Inference API)
+        
+        Returns one parsed result (or the exception raised) per batch.
+        """
         if self.use_inference_api:
-            return self._categorize_with_hf_api(prompt)
+            prompts = [self._build_prompt(files) for files in batches]
+            
+            def run_one(prompt: str):
+                try:
+                    return self._categorize_with_hf_api(prompt)
+                except Exception as e:
+                    return e
+            
+            with ThreadPoolExecutor(max_workers=self.HF_API_CONCURRENCY) as executor:
+                return list(executor.map(run_one, prompts))
+        elif self.vllm is not None:
+            return self._categorize_with_vllm(batches)
         else:
-            return self._categorize_with_hf_local(prompt)
+            return self._categorize_with_hf_local(batches)
     
     def _categorize_with_hf_api(self, prompt: str) -> Dict:
         """Categorize using Hugging Face Inference API (free tier)"""
         import requests
-        import time
         
         api_url = f"https://api-inference.huggingface.co/models/{self.model_name}"
         headers = {"Authorization": f"Bearer {self.hf_token}"}
@@ -387,8 +905,6 @@ Respond with only valid JSON:
     
     def _extract_json_from_text(self, text: str) -> Dict:
         """Extract JSON object from text, handling extra content before/after"""
-        import re
-        
         # Remove the prompt part if it's still in the response
         # Look for common markers that indicate the start of the response
         markers = ['<|assistant|>', 'assistant:', 'response:']
@@ -396,73 +912,226 @@ Respond with only valid JSON:
             if marker in text.lower():
                 text = text.split(marker, 1)[-1]
         
-        # Remove markdown code blocks FIRST (before looking for braces)
-        text = re.sub(r'^```json\s*', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = re.sub(r'^```\s*', '', text, flags=re.MULTILINE)
-        text = re.sub(r'```\s*$', '', text, flags=re.MULTILINE)
-        text = text.strip()
+        # Remove markdown code blocks
+        text = _CODE_FENCE.sub('', text).strip()
         
-        # Try to find JSON object by finding matching braces
-        # Start from the first {
         start_idx = text.find('{')
         if start_idx == -1:
             raise ValueError("No JSON object found in response")
         
-        # Find the matching closing brace
-        brace_count = 0
-        end_idx = start_idx
-        
-        for i in range(start_idx, len(text)):
-            if text[i] == '{':
-                brace_count += 1
-            elif text[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end_idx = i + 1
-                    break
-        
-        if brace_count != 0:
-            # Unmatched braces, try regex as fallback
-            json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-            else:
-                raise ValueError("Could not find complete JSON object")
-        else:
-            json_str = text[start_idx:end_idx]
-        
-        # Clean up the JSON string
-        json_str = json_str.strip()
-        
-        # Remove any remaining markdown code blocks
-        json_str = re.sub(r'^```json\s*', '', json_str, flags=re.IGNORECASE | re.MULTILINE)
-        json_str = re.sub(r'^```\s*', '', json_str, flags=re.MULTILINE)
-        json_str = re.sub(r'```\s*$', '', json_str, flags=re.MULTILINE)
-        json_str = json_str.strip()
+        # Parse the object starting at the first brace; raw_decode stops at its end
+        error = None
+        try:
+            result, _ = _JSON_DECODER.raw_decode(text, start_idx)
+            if isinstance(result, dict):
+                return result
+        except json.JSONDecodeError as e:
+            error = e
         
-        # Try to parse
+        # Try to fix common issues: remove trailing commas
+        cleaned = _TRAILING_COMMA.sub(r'\1', text)
         try:
-            return json.loads(json_str)
+            result, _ = _JSON_DECODER.raw_decode(cleaned, cleaned.find('{'))
+            if isinstance(result, dict):
+                return result
         except json.JSONDecodeError as e:
-            # Try to fix common issues
-            # Remove trailing commas
-            json_str = re.sub(r',\s*}', '}', json_str)
-            json_str = re.sub(r',\s*]', ']', json_str)
-            
+            error = e
+        
+        # Last resort: the first complete JSON object starting at a later brace
+        start_idx = text.find('{', start_idx + 1)
+        while start_idx != -1:
             try:
-                return json.loads(json_str)
+                result, _ = _JSON_DECODER.raw_decode(text, start_idx)
+                if isinstance(result, dict):
+                    return result
             except json.JSONDecodeError:
-                # Last resort: try to extract just the first valid JSON object more carefully
-                # Find the first complete JSON object by counting braces
-                raise ValueError(f"Could not parse JSON: {str(e)}. Text: {json_str[:200]}")
+                pass
+            start_idx = text.find('{', start_idx + 1)
+        
+        raise ValueError(f"Could not parse JSON: {str(error)}. Text: {text[:200]}")
     
-    def _categorize_with_hf_local(self, prompt: str) -> Dict:
-        """Categorize using local Hugging Face model"""
+    def _categorize_with_hf_local(self, batches: List[List[FileInfo]]) -> List:
+        """Categorize using local Hugging Face model, decoding all batches in one generate() call
+        
+        Returns one parsed result (or the exception raised) per batch.
+        """
         if not self.hf_model or not self.hf_tokenizer:
             raise ValueError("Hugging Face model not initialized")
         
+        inputs, generate_kwargs = self._build_local_inputs(batches)
+        outputs = self._generate_local(inputs, generate_kwargs, self.HF_MAX_NEW_TOKENS)
+        
+        # Decode only the new tokens (remove the prompt)
+        input_length = inputs['input_ids'].shape[1]
+        results = []
+        for row in outputs:
+            result_text = self.hf_tokenizer.decode(row[input_length:], skip_special_tokens=True)
+            # Extract JSON using improved method
+            try:
+                results.append(self._extract_json_from_text(result_text))
+            except ValueError as e:
+                results.append(e)
+        
+        return results
+    
+    def _generate_local(self, inputs: Dict, generate_kwargs: Dict, max_new_tokens: int):
+        """Run generate() on inputs from _build_local_inputs (static KV cache when compiled)"""
+        import torch
+        
+        if self.use_static_cache:
+            generate_kwargs["cache_implementation"] = "static"
+        
+        # Generate greedily, stopping each row as soon as its JSON object closes
+        # (max_new_tokens is only a safety cap)
+        with torch.no_grad():
+            return self.hf_model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                num_beams=1,
+                stopping_criteria=self._json_stopping_criteria(inputs["input_ids"].shape[0]),
+                pad_token_id=self.hf_tokenizer.pad_token_id,
+                eos_token_id=self.hf_tokenizer.eos_token_id,
+                **generate_kwargs
+            )
+    
+    def _categorize_with_vllm(self, batches: List[List[FileInfo]]) -> List:
+        """Categorize using the local model served by vLLM
+        
+        Returns one parsed result (or the exception raised) per batch.
+        """
+        prompts = [self._format_hf_local_prompt(self._build_prompt(files)) for files in batches]
+        outputs = self.vllm.generate(prompts, self.vllm_sampling_params, use_tqdm=False)
+        
+        results = []
+        for output in outputs:
+            try:
+                results.append(self._extract_json_from_text(output.outputs[0].text))
+            except ValueError as e:
+                results.append(e)
+        
+        return results
+    
+    def _json_stopping_criteria(self, batch_size: int):
+        """Stopping criteria that end each row once its top-level JSON object is closed"""
         import torch
+        from transformers import StoppingCriteria, StoppingCriteriaList
         
+        device = next(self.hf_model.parameters()).device
+        if self._brace_counts is None or self._brace_counts[0].device != device:
+            # Number of '{' and '}' in every vocabulary token, so no decoding is needed per step.
+            # The model's output vocab is often padded past the tokenizer's entries (and generate
+            # can emit those ids), so the tables cover it and the extra ids count no braces.
+            tokens = self.hf_tokenizer.convert_ids_to_tokens(list(range(len(self.hf_tokenizer))))
+            vocab_size = max(self.hf_model.get_output_embeddings().weight.shape[0], len(tokens))
+            opens = torch.zeros(vocab_size, dtype=torch.long, device=device)
+            closes = torch.zeros(vocab_size, dtype=torch.long, device=device)
+            opens[:len(tokens)] = torch.tensor([(t or "").count("{") for t in tokens], device=device)
+            closes[:len(tokens)] = torch.tensor([(t or "").count("}") for t in tokens], device=device)
+            self._brace_counts = (opens, closes)
+        opens, closes = self._brace_counts
+        
+        class JsonObjectClosed(StoppingCriteria):
+            """Tracks brace depth of each row's newest token"""
+            
+            def __init__(self):
+                self.depth = torch.zeros(batch_size, dtype=torch.long, device=device)
+                self.started = torch.zeros(batch_size, dtype=torch.bool, device=device)
+            
+            def __call__(self, input_ids, scores, **kwargs):
+                last_tokens = input_ids[:, -1]
+                self.depth += opens[last_tokens] - closes[last_tokens]
+                self.started |= opens[last_tokens] > 0
+                return self.started & (self.depth <= 0)
+        
+        return StoppingCriteriaList([JsonObjectClosed()])
+    
+    def _build_local_inputs(self, batches: List[List[FileInfo]]) -> Tuple[Dict, Dict]:
+        """Assemble model inputs from the cached prompt prefix/suffix and each batch's file descriptions
+        
+        Returns the inputs and extra generate() kwargs (the prefilled prefix KV cache, if any).
+        """
+        import copy
+        import torch
+        
+        head, _ = self._prompt_parts()
+        cache = self._prepare_prompt_cache(head)
+        prefix_ids, suffix_ids = cache["prefix_ids"], cache["suffix_ids"]
+        
+        # Only the file descriptions get tokenized per call. They aren't truncated:
+        # cutting the file list would leave the model an unterminated JSON array
+        dynamic_ids = self.hf_tokenizer(
+            [self._describe_files(files) for files in batches],
+            add_special_tokens=False
+        )["input_ids"]
+        bodies = [ids + suffix_ids for ids in dynamic_ids]
+        
+        length = len(prefix_ids) + max(len(body) for body in bodies)
+        if self.use_static_cache:
+            # Keep prompt shapes in a few buckets so the compiled graphs are reused
+            length = self._bucket_length(length)
+        
+        # Pad between the shared prefix and each row's files, so every row starts
+        # with the same prefix tokens and can reuse the prefilled prefix KV cache
+        pad_id = self.hf_tokenizer.pad_token_id
+        input_ids, attention_mask = [], []
+        for body in bodies:
+            pad = length - len(prefix_ids) - len(body)
+            input_ids.append(prefix_ids + [pad_id] * pad + body)
+            attention_mask.append([1] * len(prefix_ids) + [0] * pad + [1] * len(body))
+        
+        # Move to device if using GPU or Apple Silicon
+        device = next(self.hf_model.parameters()).device
+        inputs = {
+            "input_ids": torch.tensor(input_ids, device=device),
+            "attention_mask": torch.tensor(attention_mask, device=device)
+        }
+        
+        generate_kwargs = {}
+        if cache["prefix_kv"] is not None:
+            past_key_values = copy.deepcopy(cache["prefix_kv"])
+            past_key_values.batch_repeat_interleave(len(bodies))
+            generate_kwargs["past_key_values"] = past_key_values
+        
+        return inputs, generate_kwargs
+    
+    def _prepare_prompt_cache(self, head: str) -> Dict:
+        """Tokenize the static parts of the local prompt once, and prefill the prefix KV cache"""
+        if self._prompt_cache is not None and self._prompt_cache["head"] == head:
+            return self._prompt_cache
+        
+        import torch
+        
+        _, tail = self._prompt_parts()
+        formatted_prompt = self._format_hf_local_prompt(head + self.FILES_PLACEHOLDER + tail)
+        prefix_text, suffix_text = formatted_prompt.split(self.FILES_PLACEHOLDER)
+        prefix_ids = self.hf_tokenizer(prefix_text)["input_ids"]
+        suffix_ids = self.hf_tokenizer(suffix_text, add_special_tokens=False)["input_ids"]
+        
+        # The static cache used by compiled models is allocated by generate() itself
+        prefix_kv = None
+        if not self.use_static_cache:
+            try:
+                from transformers import DynamicCache
+                
+                prefix_kv = DynamicCache()
+                device = next(self.hf_model.parameters()).device
+                with torch.no_grad():
+                    self.hf_model(torch.tensor([prefix_ids], device=device), past_key_values=prefix_kv, use_cache=True)
+            except Exception as e:
+                print(f"Warning: Could not prefill prompt cache ({e}), prompts will be processed in full")
+                prefix_kv = None
+        
+        self._prompt_cache = {
+            "head": head,
+            "prefix_ids": prefix_ids,
+            "suffix_ids": suffix_ids,
+            "prefix_kv": prefix_kv
+        }
+        return self._prompt_cache
+    
+    def _format_hf_local_prompt(self, prompt: str) -> str:
+        """Wrap a prompt in the local model's chat format"""
         # Format prompt using tokenizer's chat template if available
         system_message = "You are a helpful file organization assistant. Always respond with valid JSON only, no other text."
         user_message = f"""{prompt}
@@ -497,78 +1166,19 @@ Respond with only valid JSON, no other text."""
 <|assistant|>
 """
         
-        # Tokenize
-        inputs = self.hf_tokenizer(
-            formatted_prompt,
-            return_tensors="pt",
-            truncation=True,
-            max_length=2048
-        )
-        
-        # Move to device if using GPU or Apple Silicon
-        device = next(self.hf_model.parameters()).device
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        
-        # Generate
-        with torch.no_grad():
-            outputs = self.hf_model.generate(
-                **inputs,
-                max_new_tokens=2000,
-                temperature=0.3,
-                do_sample=True,
-                pad_token_id=self.hf_tokenizer.eos_token_id,
-                eos_token_id=self.hf_tokenizer.eos_token_id
-            )
-        
-        # Decode only the new tokens (remove the prompt)
-        input_length = inputs['input_ids'].shape[1]
-        generated_tokens = outputs[0][input_length:]
-        result_text = self.hf_tokenizer.decode(generated_tokens, skip_special_tokens=True)
-        
-        # Extract JSON using improved method
-        return self._extract_json_from_text(result_text)
+        return formatted_prompt
     
     def _fallback_categorize(self, file: FileInfo) -> Dict:
         """Fallback categorization based on file extension and MIME type"""
         ext = file.extension.lower()
         mime = file.mime_type or ""
         
-        # Document types
-        if ext in ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt']:
-            category = "Documents"
-        # Images
-        elif ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.webp'] or 'image' in mime:
-            category = "Images"
-        # Videos
-        elif ext in ['.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv'] or 'video' in mime:
-            category = "Videos"
-        # Audio
-        elif ext in ['.mp3', '.wav', '.flac', '.aac', '.ogg'] or 'audio' in mime:
-            category = "Audio"
-        # Archives
-        elif ext in ['.zip', '.rar', '.7z', '.tar', '.gz']:
-            category = "Archives"
-        # Code
-        elif ext in ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.html', '.css', '.json', '.xml']:
-            category = "Code"
-        # Spreadsheets
-        elif ext in ['.xls', '.xlsx', '.csv', '.ods']:
-            category = "Spreadsheets"
-        # Presentations
-        elif ext in ['.ppt', '.pptx', '.odp']:
-            category = "Presentations"
-        # Installers
-        elif ext in ['.exe', '.msi', '.dmg', '.pkg', '.deb', '.rpm']:
-            category = "Installers"
-        else:
-            category = "Other"
+        category = EXT_TO_CATEGORY.get(ext) or MIME_PREFIX_TO_CATEGORY.get(mime.split("/", 1)[0], "Other")
         
         return {
+            **self.FALLBACK_RESULT,
             "category": category,
-            "subcategory": None,
-            "project": None,
             "suggested_name": file.name,
-            "confidence": 0.7,
             "reason": f"Categorized by extension: {ext}"
         }
     
@@ -1,38 +1,128 @@
 """
 Duplicate File Detector - Detects duplicate files and suggests cleanup
 """
+import re
 from pathlib import Path
 from typing import List, Dict, Set
 from collections import defaultdict
-from file_scanner import FileInfo
+from dataclasses import replace
+from itertools import groupby
+from operator import attrgetter
+from file_scanner import FileInfo, FileScanner
+
+try:
+    from rapidfuzz import fuzz, process, utils as fuzz_utils
+except ImportError:
+    process = None
+
+_DIGIT_RUNS = re.compile(r'\d+')
 
 
 class DuplicateDetector:
     """Detects duplicate files using hash comparison"""
     
+    # Minimum token-set similarity (0-100) for two names to count as similar
+    SIMILARITY_THRESHOLD = 85
+    # Names compared against all others per rapidfuzz call (bounds the score matrix memory)
+    SIMILARITY_BLOCK_SIZE = 128
+    
     def __init__(self):
         self.duplicates: Dict[str, List[FileInfo]] = {}
     
     def find_duplicates(self, files: List[FileInfo]) -> Dict[str, List[FileInfo]]:
         """Find duplicate files based on hash"""
-        # Group files by hash
-        hash_groups: Dict[str, List[FileInfo]] = defaultdict(list)
-        
-        for file in files:
-            if file.hash:
-                hash_groups[file.hash].append(file)
+        # Group files by hash (the sort is stable, so files keep their order within a group)
+        hashed = sorted((f for f in files if f.hash), key=attrgetter("hash"))
         
         # Find groups with more than one file (duplicates)
         duplicates = {}
-        for file_hash, file_list in hash_groups.items():
+        for file_hash, group in groupby(hashed, key=attrgetter("hash")):
+            file_list = list(group)
             if len(file_list) > 1:
                 duplicates[file_hash] = file_list
         
         self.duplicates = duplicates
         return duplicates
     
+    def find_duplicates_staged(self, files: List[FileInfo], scanner: FileScanner) -> Dict[str, List[FileInfo]]:
+        """Find duplicate files, only hashing files that could be duplicates
+        
+        Files are grouped by size, then by a hash of their head and tail, and only
+        files still colliding get fully hashed. Returned files have their hash set.
+        """
+        # Stage 1: a file with a unique size has no duplicates
+        size_groups: Dict[int, List[FileInfo]] = defaultdict(list)
+        for file in files:
+            size_groups[file.size].append(file)
+        candidates = [file for group in size_groups.values() if len(group) > 1 for file in group]
+        
+        # Stage 2: hash the first and last 64 KiB of same-size files
+        partial_hashes = scanner.compute_hashes([f.path for f in candidates], partial=True)
+        partial_groups: Dict[tuple, List[FileInfo]] = defaultdict(list)
+        for file, partial_hash in zip(candidates, partial_hashes):
+            if partial_hash:
+                partial_groups[(file.size, partial_hash)].append(file)
+        candidates = [file for group in partial_groups.values() if len(group) > 1 for file in group]
+        
+        # Stage 3: fully hash the remaining candidates
+        unhashed = [f for f in candidates if not f.hash]
+        full_hashes = dict(zip(unhashed, scanner.compute_hashes([f.path for f in unhashed])))
+        hashed = [replace(f, hash=full_hashes[f]) if f in full_hashes else f for f in candidates]
+        
+        return self.find_duplicates(hashed)
+    
     def find_similar_names(self, files: List[FileInfo]) -> List[List[FileInfo]]:
-        """Find files with similar names (potential duplicates)"""
+        """Find files with similar names (potential duplicates)
+        
+        Uses rapidfuzz token-set similarity when installed: names whose words are a subset of
+        the other's score 100 ("notes" / "meeting notes", "document" / "document copy" - on
+        purpose, copies are usually named that way), and near-identical spellings pass
+        SIMILARITY_THRESHOLD, but differently worded names like
+        "report_v2" / "report_final" (80) don't. Names whose numbers differ ("IMG_0001" /
+        "IMG_0002", "report_v2" / "report_v3") never pair, so numbered series don't chain into
+        one group. Without rapidfuzz, only identical normalized names group.
+        """
+        if process is None:
+            return self._find_identical_names(files)
+        
+        stems = [Path(f.name).stem for f in files]
+        numbers = [tuple(_DIGIT_RUNS.findall(stem)) for stem in stems]
+        
+        # Union-find over pairs of similar names
+        parent = list(range(len(files)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for start in range(0, len(stems), self.SIMILARITY_BLOCK_SIZE):
+            scores = process.cdist(
+                stems[start:start + self.SIMILARITY_BLOCK_SIZE],
+                stems,
+                scorer=fuzz.token_set_ratio,
+                processor=fuzz_utils.default_process,
+                score_cutoff=self.SIMILARITY_THRESHOLD,
+                workers=-1
+            )
+            rows, cols = scores.nonzero()
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                numbers_a, numbers_b = numbers[start + row], numbers[col]
+                if numbers_a and numbers_b and numbers_a != numbers_b:
+                    continue
+                root_a, root_b = find(start + row), find(col)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+        
+        components: Dict[int, List[FileInfo]] = defaultdict(list)
+        for i, file in enumerate(files):
+            components[find(i)].append(file)
+        
+        return [group for group in components.values() if len(group) > 1]
+    
+    def _find_identical_names(self, files: List[FileInfo]) -> List[List[FileInfo]]:
+        """Find files whose normalized names are identical"""
         name_groups: Dict[str, List[FileInfo]] = defaultdict(list)
         
         # Normalize names (lowercase, remove special chars)
@@ -2,15 +2,34 @@
 File Scanner Module - Scans directories and collects file information
 """
 import os
+import mmap
+import threading
 import hashlib
+import mimetypes
 from pathlib import Path
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import filetype
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
-@dataclass(frozen=True)
+# Bytes read from each end of a file for the partial-hash duplicate pre-filter
+PARTIAL_HASH_SIZE = 64 * 1024
+# Files larger than this are memory-mapped for hashing instead of read in chunks
+MMAP_HASH_THRESHOLD = 1 << 20
+# Extensions that say nothing about the content, so the file header is sniffed instead
+AMBIGUOUS_EXTENSIONS = ('', '.bin', '.dat')
+# How many files are scanned between progress_callback calls
+PROGRESS_INTERVAL = 64
+
+
+@dataclass(frozen=True, slots=True)
 class FileInfo:
     """Information about a file"""
     path: Path
@@ -28,86 +47,203 @@ class FileInfo:
 class FileScanner:
     """Scans directories and collects file information"""
     
-    def __init__(self, directories: List[str], compute_hash: bool = False):
+    def __init__(self, directories: List[str], compute_hash: bool = False, progress_callback=None):
+        """
+        Args:
+            directories: Directories to scan recursively
+            compute_hash: Compute a content hash for every file
+            progress_callback: Optional callback(files_found, current_path), called every
+                PROGRESS_INTERVAL files while scanning
+        """
         self.directories = [Path(d) for d in directories]
         self.compute_hash = compute_hash
+        self.progress_callback = progress_callback
         self.scanned_files: List[FileInfo] = []
+        self._files_found = 0
+        self._progress_lock = threading.Lock()
     
     def scan(self) -> List[FileInfo]:
         """Scan all specified directories and return file information"""
         self.scanned_files = []
+        self._files_found = 0
         
+        directories = []
         for directory in self.directories:
             if not directory.exists():
                 print(f"Warning: Directory {directory} does not exist, skipping...")
                 continue
-            
-            for file_path in self._walk_directory(directory):
-                try:
-                    file_info = self._get_file_info(file_path)
-                    if file_info:
-                        self.scanned_files.append(file_info)
-                except Exception as e:
-                    print(f"Error scanning {file_path}: {e}")
+            directories.append(directory)
+        
+        if len(directories) > 1:
+            # Roots often live on different drives, so walk them concurrently
+            # (scandir and stat release the GIL)
+            with ThreadPoolExecutor(max_workers=min(8, len(directories))) as executor:
+                per_directory = list(executor.map(self._scan_directory, directories))
+        else:
+            per_directory = [self._scan_directory(d) for d in directories]
+        
+        for files in per_directory:
+            self.scanned_files.extend(files)
+        
+        # Hashing is I/O-bound, so overlap it across threads once the tree is walked
+        if self.compute_hash and self.scanned_files:
+            self.scanned_files = self._hash_files(self.scanned_files)
         
         return self.scanned_files
     
+    def _scan_directory(self, directory: Path) -> List[FileInfo]:
+        """Collect file information for one directory tree"""
+        files = []
+        progress_callback = self.progress_callback
+        for entry in self._walk_directory(directory):
+            try:
+                file_info = self._get_file_info(entry)
+                if file_info:
+                    files.append(file_info)
+                    if progress_callback and len(files) % PROGRESS_INTERVAL == 0:
+                        self._report_progress(PROGRESS_INTERVAL, entry.path)
+            except Exception as e:
+                print(f"Error scanning {entry.path}: {e}")
+        return files
+    
+    def _report_progress(self, new_files: int, current_path: str):
+        """Add to the files-found count and pass it to the progress callback"""
+        with self._progress_lock:
+            self._files_found += new_files
+            self.progress_callback(self._files_found, current_path)
+    
+    def _hash_files(self, files: List[FileInfo]) -> List[FileInfo]:
+        """Compute hashes for files in parallel"""
+        hashes = self.compute_hashes([f.path for f in files])
+        return [replace(f, hash=h) for f, h in zip(files, hashes)]
+    
+    def compute_hashes(self, paths: List[Path], partial: bool = False) -> List[str]:
+        """Hash files in parallel (hashing is I/O-bound)
+        
+        Args:
+            paths: Files to hash
+            partial: Only hash the first and last PARTIAL_HASH_SIZE bytes of each file
+        """
+        hash_func = self._compute_partial_hash if partial else self._compute_hash
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(hash_func, paths))
+    
     def _walk_directory(self, directory: Path):
-        """Walk through directory and yield file paths"""
-        try:
-            for root, dirs, files in os.walk(directory):
-                # Skip hidden directories
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                
-                for file in files:
-                    # Skip hidden files
-                    if not file.startswith('.'):
-                        yield Path(root) / file
-        except PermissionError:
-            print(f"Permission denied: {directory}")
+        """Walk through directory and yield os.DirEntry objects for files"""
+        stack = [str(directory)]
+        while stack:
+            root = stack.pop()
+            try:
+                with os.scandir(root) as it:
+                    for entry in it:
+                        # Skip hidden files and directories
+                        if entry.name.startswith('.'):
+                            continue
+                        
+                        # Symlinked directories are not followed (like os.walk)
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif not entry.is_dir():
+                            yield entry
+            except PermissionError:
+                print(f"Permission denied: {root}")
+            except OSError as e:
+                print(f"Error reading {root}: {e}")
     
-    def _get_file_info(self, file_path: Path) -> Optional[FileInfo]:
+    def _get_file_info(self, entry: os.DirEntry) -> Optional[FileInfo]:
         """Get information about a file"""
+        file_path = Path(entry.path)
         try:
-            stat = file_path.stat()
+            stat = entry.stat()
             
-            # Get MIME type
-            mime_type = None
-            try:
-                kind = filetype.guess(str(file_path))
-                if kind:
-                    mime_type = kind.mime
-            except:
-                pass
+            # Same result as Path.suffix, without re-parsing the path
+            name = entry.name
+            dot_idx = name.rfind('.')
+            extension = name[dot_idx:].lower() if 0 < dot_idx < len(name) - 1 else ''
             
-            # Compute hash if requested
-            file_hash = None
-            if self.compute_hash:
-                file_hash = self._compute_hash(file_path)
+            # Get MIME type from the extension; only read the file header when that's inconclusive
+            mime_type = _mime_from_extension(extension)
+            if extension in AMBIGUOUS_EXTENSIONS:
+                try:
+                    kind = filetype.guess(entry.path)
+                    if kind:
+                        mime_type = kind.mime
+                except:
+                    pass
             
             return FileInfo(
                 path=file_path,
-                name=file_path.name,
+                name=entry.name,
                 size=stat.st_size,
-                extension=file_path.suffix.lower(),
+                extension=extension,
                 mime_type=mime_type,
                 created=datetime.fromtimestamp(stat.st_ctime),
-                modified=datetime.fromtimestamp(stat.st_mtime),
-                hash=file_hash
+                modified=datetime.fromtimestamp(stat.st_mtime)
             )
         except Exception as e:
             print(f"Error getting info for {file_path}: {e}")
             return None
     
+    def _compute_partial_hash(self, file_path: Path) -> str:
+        """Hash only the head and tail of a file - a cheap pre-filter before full hashing"""
+        try:
+            with open(file_path, "rb") as f:
+                hasher = blake3.blake3() if blake3 is not None else _blake2b()
+                hasher.update(f.read(PARTIAL_HASH_SIZE))
+                
+                size = os.fstat(f.fileno()).st_size
+                if size > PARTIAL_HASH_SIZE:
+                    f.seek(max(size - PARTIAL_HASH_SIZE, PARTIAL_HASH_SIZE))
+                    hasher.update(f.read(PARTIAL_HASH_SIZE))
+                return hasher.hexdigest()
+        except Exception as e:
+            print(f"Error computing partial hash for {file_path}: {e}")
+            return ""
+    
     def _compute_hash(self, file_path: Path, chunk_size: int = 8192) -> str:
-        """Compute MD5 hash of file"""
-        hash_md5 = hashlib.md5()
+        """Compute content hash of file (BLAKE3, or BLAKE2b when blake3 isn't installed)"""
         try:
+            if blake3 is not None:
+                with open(file_path, "rb") as f:
+                    if os.fstat(f.fileno()).st_size <= MMAP_HASH_THRESHOLD:
+                        # Small files: one read is cheaper than setting up a mapping and threads
+                        return blake3.blake3(f.read()).hexdigest()
+                
+                # Memory-maps the file and hashes it with SIMD across threads
+                hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+                hasher.update_mmap(file_path)
+                return hasher.hexdigest()
+            
             with open(file_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size > MMAP_HASH_THRESHOLD:
+                    # Hash straight from the page cache, no copy into Python bytes
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mm, "madvise"):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        hasher = _blake2b()
+                        hasher.update(mm)
+                        return hasher.hexdigest()
+                
+                if hasattr(hashlib, "file_digest"):
+                    # Python 3.11+: reads and hashes in C, no per-chunk Python loop
+                    return hashlib.file_digest(f, _blake2b).hexdigest()
+                
+                hasher = _blake2b()
                 for chunk in iter(lambda: f.read(chunk_size), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+                    hasher.update(chunk)
+                return hasher.hexdigest()
         except Exception as e:
             print(f"Error computing hash for {file_path}: {e}")
             return ""
 
+
+@lru_cache(maxsize=None)
+def _mime_from_extension(extension: str) -> Optional[str]:
+    """MIME type registered for an extension (cached, so guess_type's URL and path parsing runs once per extension)"""
+    return mimetypes.guess_type("file" + extension, strict=False)[0]
+
+
+def _blake2b():
+    """BLAKE2b with a 128-bit digest - plenty for duplicate detection"""
+    return hashlib.blake2b(digest_size=16)
@@ -2,23 +2,21 @@
 Main CLI Interface for AI File Organization Agent
 """
 import argparse
-import os
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import List
-import schedule
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from file_scanner import FileScanner
-from categorizer import FileCategorizer
-from duplicate_detector import DuplicateDetector
-from organizer import FileOrganizer
+# rich, schedule and the agent components are imported where they're used,
+# so --help and argument errors don't pay for loading them
 
-console = Console()
+
+@lru_cache(maxsize=None)
+def _get_console():
+    """Shared rich Console, created on first use"""
+    from rich.console import Console
+    return Console()
 
 
 class OrganizerAgent:
@@ -33,6 +31,11 @@ class OrganizerAgent:
     
     def initialize(self):
         """Initialize all components"""
+        from categorizer import FileCategorizer
+        from duplicate_detector import DuplicateDetector
+        from organizer import FileOrganizer
+        
+        console = _get_console()
         try:
             self.categorizer = FileCategorizer()
             self.duplicate_detector = DuplicateDetector()
@@ -44,17 +47,17 @@ class OrganizerAgent:
     
     def scan_and_organize(self, directories: List[str], interactive: bool = True):
         """Main workflow: scan, categorize, detect duplicates, and organize"""
+        from rich.panel import Panel
+        from file_scanner import FileScanner
+        
+        console = _get_console()
         console.print(Panel.fit("[bold blue]AI File Organization Agent[/bold blue]"))
         
         # Step 1: Scan files
         console.print("\n[cyan]Step 1:[/cyan] Scanning directories...")
-        self.scanner = FileScanner(directories, compute_hash=True)
+        self.scanner = FileScanner(directories)
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ):
+        with console.status("Scanning..."):
             files = self.scanner.scan()
         
         console.print(f"[green]Found {len(files)} files[/green]")
@@ -65,7 +68,7 @@ class OrganizerAgent:
         
         # Step 2: Detect duplicates
         console.print("\n[cyan]Step 2:[/cyan] Detecting duplicates...")
-        duplicates = self.duplicate_detector.find_duplicates(files)
+        duplicates = self.duplicate_detector.find_duplicates_staged(files, self.scanner)
         duplicate_summary = self.duplicate_detector.get_duplicate_summary()
         
         if duplicates:
@@ -77,14 +80,23 @@ class OrganizerAgent:
         else:
             console.print("[green]No duplicates found[/green]")
         
+        if not interactive and not self.dry_run:
+            # Nothing to preview or confirm, so move each round of files as soon as it's categorized
+            console.print("\n[cyan]Step 3:[/cyan] Categorizing and organizing files...")
+            with console.status("Categorizing...") as status:
+                self.organizer.organize_stream(
+                    self.categorizer.categorize_iter(files, progress_callback=self._status_updater(status)),
+                    organize_by_date=True,
+                    organize_by_project=True
+                )
+            
+            self._show_organization_summary()
+            return
+        
         # Step 3: Categorize files
         console.print("\n[cyan]Step 3:[/cyan] Categorizing files with AI...")
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ):
-            categorizations = self.categorizer.categorize_files(files)
+        with console.status("Categorizing...") as status:
+            categorizations = self.categorizer.categorize_files(files, progress_callback=self._status_updater(status))
         
         # Show categorization preview
         self._show_categorization_preview(categorizations)
@@ -101,22 +113,37 @@ class OrganizerAgent:
             console.print("[yellow]DRY RUN MODE - No files will be moved[/yellow]")
             self._show_dry_run_preview(files, categorizations)
         else:
-            moved_files = self.organizer.organize_by_category(
+            self.organizer.organize_by_category(
                 files,
                 categorizations,
                 organize_by_date=True,
                 organize_by_project=True
             )
             
-            summary = self.organizer.get_organization_summary()
-            console.print(f"\n[green]✓ Organized {summary['successful']} files successfully[/green]")
-            if summary['failed'] > 0:
-                console.print(f"[red]✗ Failed to organize {summary['failed']} files[/red]")
-            
-            console.print(f"[blue]Files organized to: {summary['organize_directory']}[/blue]")
+            self._show_organization_summary()
+    
+    def _status_updater(self, status):
+        """Categorizer progress callback that shows the progress in a console status spinner"""
+        def update(current: int, total: int, message: str):
+            status.update(f"Categorizing... {current}/{total} files")
+        return update
+    
+    def _show_organization_summary(self):
+        """Show how many files were organized"""
+        console = _get_console()
+        summary = self.organizer.get_organization_summary()
+        console.print(f"\n[green]✓ Organized {summary['successful']} files successfully[/green]")
+        if summary['failed'] > 0:
+            console.print(f"[red]✗ Failed to organize {summary['failed']} files[/red]")
+            self.organizer.report_errors(console)
+        
+        console.print(f"[blue]Files organized to: {summary['organize_directory']}[/blue]")
     
     def _handle_duplicates(self, duplicates: dict):
         """Handle duplicate files with user interaction"""
+        from rich.table import Table
+        
+        console = _get_console()
         suggestions = self.duplicate_detector.suggest_cleanup(duplicates)
         
         table = Table(title="Duplicate Files")
@@ -142,6 +169,9 @@ class OrganizerAgent:
     
     def _show_categorization_preview(self, categorizations: dict):
         """Show preview of file categorizations"""
+        from rich.table import Table
+        
+        console = _get_console()
         # Count by category
         category_counts = {}
         for file, cat_info in categorizations.items():
@@ -159,12 +189,16 @@ class OrganizerAgent:
     
     def _confirm_organization(self, categorizations: dict) -> bool:
         """Ask user to confirm organization"""
+        console = _get_console()
         console.print("\n[yellow]Ready to organize files. This will move files to organized folders.[/yellow]")
         response = console.input("[yellow]Continue? (y/n): [/yellow]")
         return response.lower() == 'y'
     
     def _show_dry_run_preview(self, files: List, categorizations: dict):
         """Show what would happen in dry run mode"""
+        from rich.table import Table
+        
+        console = _get_console()
         table = Table(title="Dry Run Preview - Files to be Organized")
         table.add_column("Source", style="cyan")
         table.add_column("Category", style="green")
@@ -182,6 +216,9 @@ class OrganizerAgent:
 
 def run_scheduled(directories: List[str], frequency: str):
     """Run organizer on a schedule"""
+    import schedule
+    
+    console = _get_console()
     agent = OrganizerAgent(dry_run=False)
     agent.initialize()
     
@@ -206,7 +243,11 @@ def run_scheduled(directories: List[str], frequency: str):
     try:
         while True:
             schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            # Sleep until the next job is due (capped, so the wait stays bounded)
+            delay = schedule.idle_seconds()
+            if delay is None:
+                break
+            time.sleep(max(1, min(delay, 3600)))
     except KeyboardInterrupt:
         console.print("\n[yellow]Scheduler stopped[/yellow]")
 
@@ -240,43 +281,30 @@ def main():
     )
     
     args = parser.parse_args()
+    console = _get_console()
     
     # Convert directory names to full paths
     directories = []
     home = Path.home()
     
     for dir_name in args.scan:
-        if Path(dir_name).is_absolute():
-            directories.append(dir_name)
+        path = Path(dir_name)
+        if path.is_absolute():
+            possible_paths = [path]
         else:
             # Try common locations (Windows and Unix)
-            possible_paths = [
-                home / dir_name,
-                Path(dir_name),
-                # Windows-specific paths
-                Path(os.path.expanduser(f"~/{dir_name}")),
-                # Try with capital first letter (Windows)
-                home / dir_name.capitalize(),
-            ]
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_paths = []
-            for path in possible_paths:
-                path_str = str(path)
-                if path_str not in seen:
-                    seen.add(path_str)
-                    unique_paths.append(path)
-            
-            found = False
-            for path in unique_paths:
-                if path.exists() and path.is_dir():
-                    directories.append(str(path))
-                    found = True
-                    break
-            
-            if not found:
-                console.print(f"[yellow]Warning: Directory {dir_name} not found, skipping...[/yellow]")
+            possible_paths = [home / dir_name, path]
+            # Try with capital first letter (Windows)
+            if dir_name != dir_name.capitalize():
+                possible_paths.append(home / dir_name.capitalize())
+        
+        # Checked in order, so the first existing directory wins
+        for path in possible_paths:
+            if path.is_dir():
+                directories.append(str(path))
+                break
+        else:
+            console.print(f"[yellow]Warning: Directory {dir_name} not found, skipping...[/yellow]")
     
     if not directories:
         console.print("[red]No valid directories to scan[/red]")
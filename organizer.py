@@ -1,21 +1,89 @@
 """
 File Organizer - Organizes files into structured folders
 """
+import os
+import errno
 import shutil
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from file_scanner import FileInfo
 from categorizer import FileCategorizer
 
+# Characters not allowed in file/folder names (on Windows), mapped to '_'
+_INVALID_CHARS = frozenset('<>:"/\\|?*')
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in _INVALID_CHARS})
+
+
+def _sanitize_name(name: str) -> str:
+    """Sanitize file/folder name to be filesystem-safe"""
+    # Most names are already safe - return them as-is instead of building a new string
+    if (
+        len(name) <= 200
+        and name[:1] not in (' ', '.')
+        and name[-1:] not in (' ', '.')
+        and _INVALID_CHARS.isdisjoint(name)
+    ):
+        return name
+    return _sanitize_unsafe_name(name)
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_unsafe_name(name: str) -> str:
+    """Sanitize a name that needs changes (cached, project/subcategory names repeat a lot)"""
+    # Remove invalid characters
+    name = name.translate(_SANITIZE_TABLE)
+    
+    # Remove leading/trailing spaces and dots
+    name = name.strip(' .')
+    
+    # Limit length
+    if len(name) > 200:
+        name = name[:200]
+    
+    return name
+
+
+@lru_cache(maxsize=None)
+def _month_folder(year: int, month: int) -> str:
+    """Date folder name ("YYYY-MM"); cached so files from the same month share one string"""
+    return f"{year:04d}-{month:02d}"
+
 
 class FileOrganizer:
     """Organizes files into structured folder hierarchies"""
     
+    # Most moves queued on the thread pool at once while streaming
+    MAX_PENDING_MOVES = 256
+    # Most destination folders kept open at once by the "dirfd" backend
+    MAX_DIR_FDS = 256
+    
     def __init__(self, base_organize_dir: Optional[Path] = None):
         self.base_organize_dir = base_organize_dir or Path.home() / "OrganizedFiles"
         self.organize_dir = self.base_organize_dir
-        self.moved_files: List[Dict] = []
+        # Move results as parallel arrays (see moved_files), much smaller than a dict per file
+        self._sources: List[str] = []
+        self._destinations: List[str] = []
+        self._success = bytearray()
+        self._errors: Dict[int, str] = {}
+        # Running totals, so the summary doesn't scan the results
+        self._success_count = 0
+        self._fail_count = 0
+        # Names taken in each destination folder (listed once, plus names claimed by
+        # in-flight moves) and the next free _N suffix per name, guarded by _reserve_lock
+        self._dir_listings: Dict[str, Set[str]] = {}
+        self._next_suffix: Dict[Tuple[str, str], int] = {}
+        self._reserve_lock = threading.Lock()
+        # Folders already created, so each is mkdir'ed once
+        self._mkdir_cache: Set[str] = set()
+        # "dirfd": destination folders are opened once and files renamed into them with
+        # renameat(), so the folder path isn't resolved again for every move; "sync": plain paths
+        self._io_backend = "dirfd" if os.rename in os.supports_dir_fd and hasattr(os, "O_DIRECTORY") else "sync"
+        self._dir_fds: Dict[str, int] = {}
     
     def organize_by_category(
         self,
@@ -23,132 +91,283 @@ class FileOrganizer:
         categorizations: Dict[FileInfo, Dict],
         organize_by_date: bool = False,
         organize_by_project: bool = False
-    ) -> List[Dict]:
-        """Organize files based on categorization"""
-        self.moved_files = []
-        
-        # Group files by category
-        category_groups: Dict[str, List[tuple]] = {}
-        for file, cat_info in categorizations.items():
-            category = cat_info.get("category", "Other")
-            if category not in category_groups:
-                category_groups[category] = []
-            category_groups[category].append((file, cat_info))
-        
-        # Create folder structure and move files
-        for category, file_list in category_groups.items():
-            category_path = self.organize_dir / category
-            category_path.mkdir(parents=True, exist_ok=True)
-            
-            for file, cat_info in file_list:
-                # Determine destination path
-                dest_path = self._determine_destination(file, cat_info, category_path, organize_by_date, organize_by_project)
-                
-                # Move file
-                move_info = self._move_file(file.path, dest_path, cat_info.get("suggested_name"))
-                if move_info:
-                    self.moved_files.append(move_info)
-        
-        return self.moved_files
-    
-    def _determine_destination(
+    ):
+        """Organize files based on categorization (results are in moved_files / get_organization_summary)"""
+        self._reset_run()
+        
+        # Work out every move, create the folders, then the move pass is just renames
+        moves = list(self._plan(categorizations.items(), organize_by_date, organize_by_project))
+        self._ensure_dirs({dest_dir for _, dest_dir, _ in moves})
+        self._execute(moves)
+    
+    def organize_stream(
+        self,
+        categorized: Iterable[Tuple[FileInfo, Dict]],
+        organize_by_date: bool = False,
+        organize_by_project: bool = False
+    ):
+        """Organize (file, categorization) pairs as they arrive, moving files in the background
+        
+        Moves overlap with whatever produces the pairs (e.g. FileCategorizer.categorize_iter).
+        """
+        self._reset_run()
+        self._execute(self._plan(categorized, organize_by_date, organize_by_project), create_dirs=True)
+    
+    def _reset_run(self):
+        """Clear the results and per-run state of the previous run"""
+        self._sources = []
+        self._destinations = []
+        self._success = bytearray()
+        self._errors = {}
+        self._success_count = 0
+        self._fail_count = 0
+        self._dir_listings = {}
+        self._next_suffix = {}
+        # Folders may have been removed since the last run
+        self._mkdir_cache = set()
+    
+    def _plan(
         self,
-        file: FileInfo,
-        cat_info: Dict,
-        category_path: Path,
+        categorized: Iterable[Tuple[FileInfo, Dict]],
         organize_by_date: bool,
         organize_by_project: bool
-    ) -> Path:
-        """Determine the destination path for a file"""
-        dest_path = category_path
-        
-        # Add project subfolder if applicable
-        if organize_by_project and cat_info.get("project"):
-            project_name = self._sanitize_name(cat_info["project"])
-            dest_path = dest_path / project_name
-            dest_path.mkdir(parents=True, exist_ok=True)
-        
-        # Add date subfolder if applicable
-        if organize_by_date:
-            date_folder = file.modified.strftime("%Y-%m")
-            dest_path = dest_path / date_folder
-            dest_path.mkdir(parents=True, exist_ok=True)
-        
-        # Add subcategory folder if applicable
-        if cat_info.get("subcategory"):
-            subcat_name = self._sanitize_name(cat_info["subcategory"])
-            dest_path = dest_path / subcat_name
-            dest_path.mkdir(parents=True, exist_ok=True)
-        
-        return dest_path
-    
-    def _move_file(self, source: Path, dest_dir: Path, suggested_name: Optional[str] = None) -> Optional[Dict]:
-        """Move a file to destination directory"""
+    ) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """Yield (source, destination folder, suggested name) for each categorized file
+        
+        Paths are plain strings from here on - pathlib's per-join overhead adds up over many files.
+        """
+        build_destination = self._make_path_builder(organize_by_date, organize_by_project)
+        for file, cat_info in categorized:
+            yield os.fspath(file.path), build_destination(file, cat_info), cat_info.get("suggested_name")
+    
+    def _ensure_dirs(self, dirs: Iterable[str]):
+        """Create all destination folders"""
+        for path in dirs:
+            self._ensure_dir(path)
+    
+    def _execute(self, moves: Iterable[Tuple[str, str, Optional[str]]], create_dirs: bool = False):
+        """Carry out planned moves (creating each destination folder first if create_dirs)"""
+        # Moves are I/O-bound, so overlap them across threads; results are recorded in order
+        pending = deque()
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                try:
+                    for source, dest_dir, suggested_name in moves:
+                        if create_dirs:
+                            self._ensure_dir(dest_dir)
+                        
+                        future = executor.submit(self._move_file, source, dest_dir, suggested_name, self._dir_fd(dest_dir))
+                        pending.append((source, future))
+                        if len(pending) >= self.MAX_PENDING_MOVES:
+                            self._record_move(*pending.popleft())
+                finally:
+                    # Submitted moves still run if `moves` raises partway, so record them too
+                    while pending:
+                        self._record_move(*pending.popleft())
+        finally:
+            for fd in self._dir_fds.values():
+                os.close(fd)
+            self._dir_fds = {}
+    
+    def _record_move(self, source: str, future: Future):
+        """Store the result of a finished move"""
+        destination, error = future.result()
+        if error is not None:
+            self._errors[len(self._success)] = error
+            self._fail_count += 1
+        else:
+            self._success_count += 1
+        self._sources.append(source)
+        self._destinations.append(destination)
+        self._success.append(error is None)
+    
+    @property
+    def moved_files(self) -> List[Dict]:
+        """Results of the last organize_by_category run, one dict per file"""
+        moved_files = []
+        for i, (source, destination) in enumerate(zip(self._sources, self._destinations)):
+            move_info = {"source": source, "destination": destination, "success": bool(self._success[i])}
+            if i in self._errors:
+                move_info["error"] = self._errors[i]
+            moved_files.append(move_info)
+        return moved_files
+    
+    @property
+    def moved_sources(self) -> Set[str]:
+        """Source paths of the files the last run moved successfully"""
+        return {source for source, success in zip(self._sources, self._success) if success}
+    
+    def _make_path_builder(self, organize_by_date: bool, organize_by_project: bool) -> Callable[[FileInfo, Dict], str]:
+        """Return a function giving a file's destination folder (doesn't create it, see _ensure_dirs)
+        
+        The date/project options are fixed for a run, so they're checked once here rather than per file:
+        category / [project] / [YYYY-MM] / [subcategory]
+        """
+        organize_dir = os.fspath(self.organize_dir)
+        join = os.path.join
+        
+        def add_subcategory(dest_path: str, cat_info: Dict) -> str:
+            subcategory = cat_info.get("subcategory")
+            return join(dest_path, _sanitize_name(subcategory)) if subcategory else dest_path
+        
+        if organize_by_project and organize_by_date:
+            def build(file: FileInfo, cat_info: Dict) -> str:
+                dest_path = join(organize_dir, cat_info.get("category", "Other"))
+                project = cat_info.get("project")
+                if project:
+                    dest_path = join(dest_path, _sanitize_name(project))
+                dest_path = join(dest_path, _month_folder(file.modified.year, file.modified.month))
+                return add_subcategory(dest_path, cat_info)
+        elif organize_by_project:
+            def build(file: FileInfo, cat_info: Dict) -> str:
+                dest_path = join(organize_dir, cat_info.get("category", "Other"))
+                project = cat_info.get("project")
+                if project:
+                    dest_path = join(dest_path, _sanitize_name(project))
+                return add_subcategory(dest_path, cat_info)
+        elif organize_by_date:
+            def build(file: FileInfo, cat_info: Dict) -> str:
+                dest_path = join(
+                    organize_dir,
+                    cat_info.get("category", "Other"),
+                    _month_folder(file.modified.year, file.modified.month)
+                )
+                return add_subcategory(dest_path, cat_info)
+        else:
+            def build(file: FileInfo, cat_info: Dict) -> str:
+                return add_subcategory(join(organize_dir, cat_info.get("category", "Other")), cat_info)
+        
+        return build
+    
+    def _move_file(
+        self,
+        source: str,
+        dest_dir: str,
+        suggested_name: Optional[str] = None,
+        dest_dir_fd: Optional[int] = None
+    ) -> Tuple[str, Optional[str]]:
+        """Move a file to destination directory (dest_dir_fd: the folder opened by _dir_fd, if any)
+        
+        Returns the destination path (or directory, on failure) and the error message, if any.
+        """
         try:
             # Use suggested name if provided, otherwise keep original name
-            dest_name = suggested_name if suggested_name else source.name
-            dest_name = self._sanitize_name(dest_name)
-            dest_path = dest_dir / dest_name
+            dest_name = suggested_name if suggested_name else os.path.basename(source)
+            base_name = _sanitize_name(dest_name)
             
-            # Handle name conflicts
-            if dest_path.exists():
-                # Add number suffix
-                stem = dest_path.stem
-                suffix = dest_path.suffix
-                counter = 1
-                while dest_path.exists():
-                    dest_path = dest_dir / f"{stem}_{counter}{suffix}"
-                    counter += 1
+            while True:
+                # Handle name conflicts (also with names other threads are about to move to)
+                with self._reserve_lock:
+                    dest_name = self._claim_name(dest_dir, base_name)
+                dest_path = os.path.join(dest_dir, dest_name)
+                # The folder listing may be stale (e.g. another process organizing into the same
+                # folder), and the rename below replaces existing files, so check the name once
+                if not os.path.lexists(dest_path):
+                    break
             
-            # Move file
-            shutil.move(str(source), str(dest_path))
+            # Move file - a plain rename unless the destination is on another filesystem
+            try:
+                if dest_dir_fd is not None:
+                    os.rename(source, dest_name, dst_dir_fd=dest_dir_fd)
+                else:
+                    os.replace(source, dest_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(source, dest_path)
             
-            return {
-                "source": str(source),
-                "destination": str(dest_path),
-                "success": True
-            }
+            return dest_path, None
         except Exception as e:
-            print(f"Error moving {source} to {dest_dir}: {e}")
-            return {
-                "source": str(source),
-                "destination": str(dest_dir),
-                "success": False,
-                "error": str(e)
-            }
-    
-    def _sanitize_name(self, name: str) -> str:
-        """Sanitize file/folder name to be filesystem-safe"""
-        # Remove invalid characters
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            name = name.replace(char, '_')
-        
-        # Remove leading/trailing spaces and dots
-        name = name.strip(' .')
-        
-        # Limit length
-        if len(name) > 200:
-            name = name[:200]
+            # Reported all at once by report_errors, so output doesn't interleave
+            return dest_dir, str(e)
+    
+    def _claim_name(self, dest_dir: str, name: str) -> str:
+        """Pick a free name in dest_dir, adding a number suffix on conflicts, and mark it taken
         
+        Must be called with _reserve_lock held. Each folder is listed once per run instead of
+        stat()ing every candidate name; _move_file checks the name it got before moving. Names
+        are compared case-insensitively, so conflicts are also caught on case-insensitive
+        filesystems (macOS, Windows).
+        """
+        taken = self._dir_listings.get(dest_dir)
+        if taken is None:
+            taken = self._dir_listings[dest_dir] = {entry.casefold() for entry in os.listdir(dest_dir)}
+        
+        if name.casefold() in taken:
+            # Add number suffix, continuing after the highest one already used
+            stem, suffix = os.path.splitext(name)
+            key = (dest_dir, name.casefold())
+            counter = self._next_suffix.get(key)
+            if counter is None:
+                prefix, folded_suffix = f"{stem}_".casefold(), suffix.casefold()
+                used = [
+                    entry[len(prefix):len(entry) - len(folded_suffix)]
+                    for entry in taken
+                    if entry.startswith(prefix) and entry.endswith(folded_suffix)
+                ]
+                counter = max((int(n) for n in used if n.isdigit()), default=0) + 1
+            
+            while f"{stem}_{counter}{suffix}".casefold() in taken:
+                counter += 1
+            name = f"{stem}_{counter}{suffix}"
+            self._next_suffix[key] = counter + 1
+        
+        taken.add(name.casefold())
         return name
     
+    def _dir_fd(self, path: str) -> Optional[int]:
+        """File descriptor of an (existing) destination folder for the "dirfd" backend, else None"""
+        if self._io_backend != "dirfd":
+            return None
+        
+        fd = self._dir_fds.get(path)
+        if fd is None and len(self._dir_fds) < self.MAX_DIR_FDS:
+            try:
+                fd = self._dir_fds[path] = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                return None
+        return fd
+    
+    def _ensure_dir(self, path: Union[str, Path]):
+        """Create a folder (and its parents) unless it was already created"""
+        key = os.fspath(path)
+        if key not in self._mkdir_cache:
+            os.makedirs(key, exist_ok=True)
+            self._mkdir_cache.add(key)
+    
     def create_folder_structure(self, categories: List[str]):
         """Create base folder structure"""
-        self.organize_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(self.organize_dir)
         
         for category in categories:
             category_path = self.organize_dir / category
-            category_path.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(category_path)
+    
+    def report_errors(self, console, limit: int = 50):
+        """Print the failed moves of the last run as one table on a rich Console"""
+        if not self._errors:
+            return
+        
+        from rich.table import Table
+        
+        table = Table(title="Files That Could Not Be Moved")
+        table.add_column("Source", style="cyan")
+        table.add_column("Destination", style="blue")
+        table.add_column("Error", style="red")
+        
+        for i, error in list(self._errors.items())[:limit]:
+            table.add_row(self._sources[i], self._destinations[i], error)
+        
+        console.print(table)
+        if len(self._errors) > limit:
+            console.print(f"[dim]... and {len(self._errors) - limit} more errors[/dim]")
     
     def get_organization_summary(self) -> Dict:
         """Get summary of organization operations"""
-        successful = sum(1 for m in self.moved_files if m.get("success", False))
-        failed = len(self.moved_files) - successful
-        
         return {
-            "total_files": len(self.moved_files),
-            "successful": successful,
-            "failed": failed,
+            "total_files": self._success_count + self._fail_count,
+            "successful": self._success_count,
+            "failed": self._fail_count,
             "organize_directory": str(self.organize_dir)
         }
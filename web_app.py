@@ -1,17 +1,18 @@
 """
 Web Interface for AI File Organization Agent
 """
-import json
 import os
 from pathlib import Path
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
 from flask_cors import CORS
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 import threading
 import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from file_scanner import FileScanner, FileInfo
-from categorizer import FileCategorizer
+from categorizer import FileCategorizer, _json_dumpb
 from duplicate_detector import DuplicateDetector
 from organizer import FileOrganizer
 
@@ -35,6 +36,44 @@ scan_results = {
     }
 }
 
+# FileInfo objects from the last scan (scan_results["files"] is their JSON view),
+# kept so later phases don't have to rebuild and re-stat them. Both lists are only ever
+# replaced, never changed in place, so readers can hold on to the list they got.
+_scanned_files: List[FileInfo] = []
+
+# /api/categorizations response, built once per categorization run (None until then)
+_files_with_cats_cache: Optional[List[Dict]] = None
+_category_counts: Dict[str, int] = {}
+
+# Scan, categorize, organize and duplicate jobs run one at a time on a single worker,
+# so overlapping requests can't thrash the disk
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="organizer")
+_job_lock = threading.Lock()
+_current_job: Optional[Future] = None
+
+# /api/browse allows the home directory, external drives (macOS) and other users' homes
+_ALLOWED_PREFIXES = (str(Path.home()), '/Volumes', '/Users')
+
+# Scan records serialized per chunk when streaming /api/files
+FILES_STREAM_CHUNK = 1000
+
+# /api/common-directories response, reused for COMMON_DIRS_TTL seconds
+COMMON_DIRS_TTL = 5.0
+_common_dirs_cache = {"at": 0.0, "data": None}
+
+# Bumped and notified whenever the status or progress changes, to wake /api/events streams
+_status_changed = threading.Condition()
+_status_version = 0
+# Distinguishes versions from different server runs in /api/status ETags
+_STATUS_EPOCH = format(time.time_ns(), "x")
+
+# Each /api/events stream holds a server thread, so streams end after EVENTS_STREAM_LIFETIME
+# seconds (EventSource reconnects by itself) and at most MAX_EVENT_STREAMS run at once
+EVENTS_STREAM_LIFETIME = 60.0
+MAX_EVENT_STREAMS = 16
+SERVER_THREADS = 32
+_event_stream_slots = threading.BoundedSemaphore(MAX_EVENT_STREAMS)
+
 
 class WebOrganizerAgent:
     """Organizer agent for web interface"""
@@ -61,7 +100,7 @@ class WebOrganizerAgent:
     def scan_directories(self, directories: List[str]):
         """Scan directories for files"""
         try:
-            scanner = FileScanner(directories, compute_hash=True)
+            scanner = FileScanner(directories)
             files = scanner.scan()
             return True, f"Found {len(files)} files", files
         except Exception as e:
@@ -70,7 +109,7 @@ class WebOrganizerAgent:
     def find_duplicates(self, files: List[FileInfo]) -> Dict:
         """Find duplicate files"""
         try:
-            duplicates = self.duplicate_detector.find_duplicates(files)
+            duplicates = self.duplicate_detector.find_duplicates_staged(files, FileScanner([]))
             summary = self.duplicate_detector.get_duplicate_summary()
             return {
                 "success": True,
@@ -95,16 +134,14 @@ class WebOrganizerAgent:
     
     def organize_files(
         self,
-        files: List[FileInfo],
-        categorizations: Dict[FileInfo, Dict],
+        categorized: Iterable[Tuple[FileInfo, Dict]],
         organize_by_date: bool = True,
         organize_by_project: bool = True
     ):
-        """Organize files into folders"""
+        """Organize (file, categorization) pairs into folders"""
         try:
-            moved_files = self.organizer.organize_by_category(
-                files,
-                categorizations,
+            self.organizer.organize_stream(
+                categorized,
                 organize_by_date=organize_by_date,
                 organize_by_project=organize_by_project
             )
@@ -114,6 +151,98 @@ class WebOrganizerAgent:
             return False, f"Error organizing: {str(e)}", {}
 
 
+def _json_response(obj, status: int = 200) -> Response:
+    """JSON response for the large or frequently polled endpoints (faster than jsonify)"""
+    return Response(_json_dumpb(obj), status=status, mimetype='application/json')
+
+
+def _notify_status():
+    """Wake /api/events streams after scan_results' status or progress changed"""
+    global _status_version
+    with _status_changed:
+        _status_version += 1
+        _status_changed.notify_all()
+
+
+def _status_payload() -> Dict:
+    """Current status, as sent by /api/status and /api/events"""
+    return {
+        "status": scan_results["status"],
+        "message": scan_results["message"],
+        "files_count": len(scan_results["files"]),
+        "categorizations_count": len(scan_results["categorizations"]),
+        "initialized": organizer_agent.initialized if organizer_agent else False,
+        "progress": scan_results.get("progress", {
+            "current": 0,
+            "total": 0,
+            "phase": "idle",
+            "current_file": "",
+            "files_found": 0
+        })
+    }
+
+
+def _build_categorizations_view() -> List[Dict]:
+    """Join the scanned files with their categorizations and count files per category"""
+    global _files_with_cats_cache, _category_counts
+    categorizations = scan_results["categorizations"]
+    _files_with_cats_cache = [
+        {**file_data, "categorization": categorizations.get(file_data["path"], {})}
+        for file_data in scan_results["files"]
+    ]
+    _category_counts = dict(Counter(cat.get("category", "Other") for cat in categorizations.values()))
+    return _files_with_cats_cache
+
+
+def _invalidate_categorizations_view():
+    """Drop the cached /api/categorizations response after the files or categorizations change"""
+    global _files_with_cats_cache, _category_counts
+    _files_with_cats_cache = None
+    _category_counts = {}
+
+
+def _drop_scanned_files(paths: Set[str]):
+    """Remove files (by path) from the kept scan results and their categorizations"""
+    global _scanned_files
+    _scanned_files = [f for f in _scanned_files if str(f.path) not in paths]
+    scan_results["files"] = [f for f in scan_results["files"] if f["path"] not in paths]
+    scan_results["categorizations"] = {
+        path: cat for path, cat in scan_results["categorizations"].items() if path not in paths
+    }
+    _invalidate_categorizations_view()
+
+
+def _prune_missing_files() -> List[FileInfo]:
+    """Drop scanned files deleted or moved since the scan (one lstat each) and return the rest"""
+    missing = {str(f.path) for f in _scanned_files if not os.path.lexists(f.path)}
+    if missing:
+        _drop_scanned_files(missing)
+    return _scanned_files
+
+
+def _claim_job() -> bool:
+    """Reserve the worker for a new job, or return False if one is still running"""
+    global _current_job
+    with _job_lock:
+        if _current_job is not None and not _current_job.done():
+            return False
+        # Placeholder until _start_job submits the work
+        _current_job = Future()
+        return True
+
+
+def _start_job(fn):
+    """Run a job claimed with _claim_job on the worker"""
+    global _current_job
+    with _job_lock:
+        _current_job = _executor.submit(fn)
+
+
+def _job_running_response():
+    """Response for a job request while another job is still running"""
+    return jsonify({"success": False, "message": "A job is already running"}), 409
+
+
 def init_agent():
     """Initialize the organizer agent"""
     global organizer_agent
@@ -131,20 +260,45 @@ def index():
 @app.route('/api/status')
 def get_status():
     """Get current status"""
-    return jsonify({
-        "status": scan_results["status"],
-        "message": scan_results["message"],
-        "files_count": len(scan_results["files"]),
-        "categorizations_count": len(scan_results["categorizations"]),
-        "initialized": organizer_agent.initialized if organizer_agent else False,
-        "progress": scan_results.get("progress", {
-            "current": 0,
-            "total": 0,
-            "phase": "idle",
-            "current_file": "",
-            "files_found": 0
-        })
-    })
+    # The status version changes with every update, so it serves as the ETag without hashing
+    etag = f"{_STATUS_EPOCH}-{_status_version}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = _json_response(_status_payload())
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.route('/api/events')
+def status_events():
+    """Stream status changes as Server-Sent Events, instead of polling /api/status"""
+    if not _event_stream_slots.acquire(blocking=False):
+        # The dashboard falls back to polling /api/status
+        return jsonify({"success": False, "message": "Too many open event streams"}), 503
+    
+    def stream():
+        seen = -1
+        deadline = time.monotonic() + EVENTS_STREAM_LIFETIME
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            with _status_changed:
+                # Time out now and then so closed connections are noticed
+                _status_changed.wait_for(lambda: _status_version != seen, timeout=min(15, remaining))
+                changed = _status_version != seen
+                seen = _status_version
+            if changed:
+                yield b"data: " + _json_dumpb(_status_payload()) + b"\n\n"
+            else:
+                yield b": keep-alive\n\n"
+    
+    response = Response(stream(), mimetype='text/event-stream', headers={"Cache-Control": "no-cache"})
+    # Runs when the server closes the response, even if the stream never started
+    response.call_on_close(_event_stream_slots.release)
+    return response
 
 
 @app.route('/api/initialize', methods=['POST'])
@@ -157,6 +311,7 @@ def initialize():
     else:
         scan_results["status"] = "error"
         scan_results["message"] = message
+    _notify_status()
     return jsonify({"success": success, "message": message})
 
 
@@ -168,6 +323,8 @@ def scan():
     
     if not directories:
         return jsonify({"success": False, "message": "No directories specified"}), 400
+    if not _claim_job():
+        return _job_running_response()
     
     scan_results["status"] = "scanning"
     scan_results["message"] = "Scanning directories..."
@@ -180,49 +337,43 @@ def scan():
     }
     
     def do_scan():
-        global organizer_agent
+        global organizer_agent, _scanned_files
         if organizer_agent is None or not organizer_agent.initialized:
             success, msg = init_agent()
             if not success:
                 scan_results["status"] = "error"
                 scan_results["message"] = msg
                 scan_results["progress"]["phase"] = "error"
+                _notify_status()
                 return
         
         try:
-            # Create a custom scanner that reports progress
-            from file_scanner import FileScanner
-            scanner = FileScanner(directories, compute_hash=True)
+            # Report files found so far while scanning; the total isn't known until the scan ends
+            def update_progress(count, path):
+                scan_results["progress"].update(current=count, files_found=count, current_file=path)
+                _notify_status()
+            
+            scanner = FileScanner(directories, progress_callback=update_progress)
             
-            # Scan with progress tracking
-            files = []
             scan_results["progress"]["phase"] = "scanning"
             scan_results["progress"]["current_file"] = "Starting scan..."
+            _notify_status()
             
-            # Use the scanner's scan method but track progress
-            for directory in directories:
-                scan_results["progress"]["current_file"] = f"Scanning: {directory}"
-                dir_path = Path(directory)
-                if dir_path.exists() and dir_path.is_dir():
-                    # Count files first for progress estimation
-                    file_count = sum(1 for _ in dir_path.rglob('*') if _.is_file())
-                    scan_results["progress"]["total"] += file_count
-            
-            # Now do the actual scan
             files = scanner.scan()
             
+            _scanned_files = files
             scan_results["files"] = [
                 {
                     "path": str(f.path),
                     "name": f.name,
                     "size": f.size,
-                    "size_mb": round(f.size / (1024 * 1024), 2),
                     "extension": f.extension,
                     "mime_type": f.mime_type,
                     "modified": f.modified.isoformat() if f.modified else None
                 }
                 for f in files
             ]
+            _invalidate_categorizations_view()
             
             scan_results["status"] = "scanned"
             scan_results["message"] = f"Found {len(files)} files"
@@ -237,20 +388,29 @@ def scan():
             scan_results["status"] = "error"
             scan_results["message"] = f"Error scanning: {str(e)}"
             scan_results["progress"]["phase"] = "error"
+        _notify_status()
     
-    thread = threading.Thread(target=do_scan)
-    thread.start()
+    _notify_status()
+    _start_job(do_scan)
     
     return jsonify({"success": True, "message": "Scan started"})
 
 
 @app.route('/api/files')
 def get_files():
-    """Get scanned files"""
-    return jsonify({
-        "files": scan_results["files"],
-        "count": len(scan_results["files"])
-    })
+    """Get scanned files, streamed in chunks so large scans aren't serialized into one buffer"""
+    # A new scan replaces the list rather than changing it, so this snapshot stays consistent
+    files = scan_results["files"]
+    
+    def stream():
+        yield b'{"count":%d,"files":[' % len(files)
+        for i in range(0, len(files), FILES_STREAM_CHUNK):
+            # Serialize the chunk as a list and drop its brackets
+            chunk = _json_dumpb(files[i:i + FILES_STREAM_CHUNK])[1:-1]
+            yield chunk if i == 0 else b"," + chunk
+        yield b"]}"
+    
+    return Response(stream(), mimetype='application/json')
 
 
 @app.route('/api/categorize', methods=['POST'])
@@ -258,6 +418,8 @@ def categorize():
     """Categorize files using AI"""
     if not scan_results["files"]:
         return jsonify({"success": False, "message": "No files to categorize. Please scan first."}), 400
+    if not _claim_job():
+        return _job_running_response()
     
     scan_results["status"] = "categorizing"
     scan_results["message"] = "Categorizing files with AI..."
@@ -271,21 +433,8 @@ def categorize():
     
     def do_categorize():
         global organizer_agent
-        # Reconstruct FileInfo objects from stored data
-        files = []
-        for f_data in scan_results["files"]:
-            file_path = Path(f_data["path"])
-            if file_path.exists():
-                from datetime import datetime
-                files.append(FileInfo(
-                    path=file_path,
-                    name=f_data["name"],
-                    size=f_data["size"],
-                    extension=f_data["extension"],
-                    mime_type=f_data.get("mime_type"),
-                    created=datetime.fromtimestamp(file_path.stat().st_ctime),
-                    modified=datetime.fromtimestamp(file_path.stat().st_mtime)
-                ))
+        _invalidate_categorizations_view()
+        files = _prune_missing_files()
         
         # Progress callback to update scan_results
         def update_progress(current, total, current_file):
@@ -296,6 +445,7 @@ def categorize():
             # Calculate percentage for better feedback
             percent = (current / total * 100) if total > 0 else 0
             scan_results["message"] = f"Categorizing: {current:,}/{total:,} files ({percent:.1f}%)"
+            _notify_status()
         
         success, message, categorizations = organizer_agent.categorize_files(files, progress_callback=update_progress)
         
@@ -312,6 +462,7 @@ def categorize():
                 }
                 for f, cat in categorizations.items()
             }
+            _build_categorizations_view()
             scan_results["status"] = "categorized"
             scan_results["message"] = message
             scan_results["progress"] = {
@@ -325,9 +476,10 @@ def categorize():
             scan_results["status"] = "error"
             scan_results["message"] = message
             scan_results["progress"]["phase"] = "error"
+        _notify_status()
     
-    thread = threading.Thread(target=do_categorize)
-    thread.start()
+    _notify_status()
+    _start_job(do_categorize)
     
     return jsonify({"success": True, "message": "Categorization started"})
 
@@ -335,25 +487,14 @@ def categorize():
 @app.route('/api/categorizations')
 def get_categorizations():
     """Get file categorizations"""
-    # Combine files with their categorizations
-    files_with_cats = []
-    for file_data in scan_results["files"]:
-        file_path = file_data["path"]
-        cat_data = scan_results["categorizations"].get(file_path, {})
-        files_with_cats.append({
-            **file_data,
-            "categorization": cat_data
-        })
-    
-    # Count by category
-    category_counts = {}
-    for cat_data in scan_results["categorizations"].values():
-        category = cat_data.get("category", "Other")
-        category_counts[category] = category_counts.get(category, 0) + 1
+    # Built when categorization finishes; only rebuilt here after a new scan
+    files_with_cats = _files_with_cats_cache
+    if files_with_cats is None:
+        files_with_cats = _build_categorizations_view()
     
-    return jsonify({
+    return _json_response({
         "files": files_with_cats,
-        "category_counts": category_counts,
+        "category_counts": _category_counts,
         "total": len(files_with_cats)
     })
 
@@ -367,6 +508,8 @@ def organize():
     data = request.json
     organize_by_date = data.get("organize_by_date", True)
     organize_by_project = data.get("organize_by_project", True)
+    if not _claim_job():
+        return _job_running_response()
     
     scan_results["status"] = "organizing"
     scan_results["message"] = "Organizing files..."
@@ -380,36 +523,23 @@ def organize():
     
     def do_organize():
         global organizer_agent
-        # Reconstruct FileInfo objects and categorizations
-        files = []
-        categorizations = {}
-        
-        for f_data in scan_results["files"]:
-            file_path = Path(f_data["path"])
-            if file_path.exists():
-                from datetime import datetime
-                file_info = FileInfo(
-                    path=file_path,
-                    name=f_data["name"],
-                    size=f_data["size"],
-                    extension=f_data["extension"],
-                    mime_type=f_data.get("mime_type"),
-                    created=datetime.fromtimestamp(file_path.stat().st_ctime),
-                    modified=datetime.fromtimestamp(file_path.stat().st_mtime)
-                )
-                files.append(file_info)
-                
-                # Get categorization for this file
-                cat_data = scan_results["categorizations"].get(str(file_path), {})
-                categorizations[file_info] = cat_data
+        files = _prune_missing_files()
+        # Categorizations are keyed by path string; pair them up without hashing FileInfo objects
+        categorizations = scan_results["categorizations"]
+        categorized = [(f, categorizations.get(str(f.path), {})) for f in files]
         
         success, message, summary = organizer_agent.organize_files(
-            files,
-            categorizations,
+            categorized,
             organize_by_date=organize_by_date,
             organize_by_project=organize_by_project
         )
         
+        # Moved files are gone from their scanned paths (also after a run that failed partway),
+        # so later categorize/organize runs must not pick them up
+        moved = organizer_agent.organizer.moved_sources
+        if moved:
+            _drop_scanned_files(moved)
+        
         if success:
             scan_results["status"] = "organized"
             scan_results["message"] = message
@@ -425,9 +555,10 @@ def organize():
             scan_results["status"] = "error"
             scan_results["message"] = message
             scan_results["progress"]["phase"] = "error"
+        _notify_status()
     
-    thread = threading.Thread(target=do_organize)
-    thread.start()
+    _notify_status()
+    _start_job(do_organize)
     
     return jsonify({"success": True, "message": "Organization started"})
 
@@ -437,28 +568,15 @@ def find_duplicates():
     """Find duplicate files"""
     if not scan_results["files"]:
         return jsonify({"success": False, "message": "No files to check. Please scan first."}), 400
+    if not _claim_job():
+        return _job_running_response()
     
     scan_results["status"] = "checking_duplicates"
     scan_results["message"] = "Checking for duplicates..."
     
     def do_find_duplicates():
         global organizer_agent
-        # Reconstruct FileInfo objects
-        files = []
-        for f_data in scan_results["files"]:
-            file_path = Path(f_data["path"])
-            if file_path.exists():
-                from datetime import datetime
-                files.append(FileInfo(
-                    path=file_path,
-                    name=f_data["name"],
-                    size=f_data["size"],
-                    extension=f_data["extension"],
-                    mime_type=f_data.get("mime_type"),
-                    created=datetime.fromtimestamp(file_path.stat().st_ctime),
-                    modified=datetime.fromtimestamp(file_path.stat().st_mtime),
-                    hash=f_data.get("hash")
-                ))
+        files = _scanned_files
         
         result = organizer_agent.find_duplicates(files)
         scan_results["duplicates"] = result
@@ -469,9 +587,10 @@ def find_duplicates():
         else:
             scan_results["status"] = "error"
             scan_results["message"] = result.get("error", "Error finding duplicates")
+        _notify_status()
     
-    thread = threading.Thread(target=do_find_duplicates)
-    thread.start()
+    _notify_status()
+    _start_job(do_find_duplicates)
     
     return jsonify({"success": True, "message": "Duplicate check started"})
 
@@ -479,11 +598,15 @@ def find_duplicates():
 @app.route('/api/reset', methods=['POST'])
 def reset():
     """Reset scan results"""
+    global _scanned_files
+    _scanned_files = []
     scan_results["files"] = []
     scan_results["categorizations"] = {}
+    _invalidate_categorizations_view()
     scan_results["duplicates"] = {}
     scan_results["status"] = "idle"
     scan_results["message"] = "Ready to scan"
+    _notify_status()
     return jsonify({"success": True, "message": "Reset complete"})
 
 
@@ -504,11 +627,7 @@ def browse_directory():
         # 4. Direct paths that exist and are accessible
         
         path_str = str(path_obj)
-        is_allowed = (
-            path_str.startswith(str(home)) or
-            path_str.startswith('/Volumes') or
-            path_str.startswith('/Users')
-        )
+        is_allowed = path_str.startswith(_ALLOWED_PREFIXES)
         
         # If path is not in allowed areas, check if it's a direct volume mount
         if not is_allowed:
@@ -532,31 +651,32 @@ def browse_directory():
         
         items = []
         try:
-            for item in sorted(path_obj.iterdir()):
+            # DirEntry answers is_dir/is_file from the directory listing instead of a stat() each
+            with os.scandir(path_obj) as it:
+                # Skip hidden files/folders before sorting (scandir never yields . or ..)
+                entries = [e for e in it if not e.name.startswith('.')]
+            entries.sort(key=lambda e: e.name)
+            
+            for entry in entries:
                 try:
-                    # Skip hidden files/folders (except .)
-                    if item.name.startswith('.') and item.name != '.':
-                        continue
-                    
+                    is_file = entry.is_file()
                     item_info = {
-                        "name": item.name,
-                        "path": str(item),
-                        "is_directory": item.is_dir(),
-                        "is_file": item.is_file(),
+                        "name": entry.name,
+                        "path": entry.path,
+                        "is_directory": entry.is_dir(),
+                        "is_file": is_file,
                     }
                     
-                    if item.is_file():
+                    if is_file:
                         try:
-                            stat = item.stat()
-                            item_info["size"] = stat.st_size
-                            item_info["size_mb"] = round(stat.st_size / (1024 * 1024), 2)
-                        except:
+                            size = entry.stat().st_size
+                            item_info["size"] = size
+                            item_info["size_mb"] = round(size / (1024 * 1024), 2)
+                        except OSError:
                             pass
                     
                     items.append(item_info)
-                except PermissionError:
-                    continue
-                except Exception:
+                except OSError:
                     continue
         
         except PermissionError:
@@ -575,23 +695,27 @@ def browse_directory():
 @app.route('/api/common-directories', methods=['GET'])
 def get_common_directories():
     """Get common directory paths"""
+    now = time.monotonic()
+    if _common_dirs_cache["data"] is not None and now - _common_dirs_cache["at"] < COMMON_DIRS_TTL:
+        return jsonify(_common_dirs_cache["data"])
+    
     home = Path.home()
     common_dirs = []
     
     common_paths = [
-        ("Home", str(home)),
-        ("Downloads", str(home / "Downloads")),
-        ("Desktop", str(home / "Desktop")),
-        ("Documents", str(home / "Documents")),
-        ("Pictures", str(home / "Pictures")),
-        ("Videos", str(home / "Videos")),
-        ("Music", str(home / "Music")),
+        ("Home", home),
+        ("Downloads", home / "Downloads"),
+        ("Desktop", home / "Desktop"),
+        ("Documents", home / "Documents"),
+        ("Pictures", home / "Pictures"),
+        ("Videos", home / "Videos"),
+        ("Music", home / "Music"),
     ]
     
-    for name, path in common_paths:
-        path_obj = Path(path)
-        if path_obj.exists() and path_obj.is_dir():
-            common_dirs.append({"name": name, "path": path})
+    for name, path_obj in common_paths:
+        # is_dir() is False for missing paths, so no separate exists() check
+        if path_obj.is_dir():
+            common_dirs.append({"name": name, "path": str(path_obj)})
     
     # Add Volumes if it exists (for external drives on macOS)
     volumes = Path("/Volumes")
@@ -604,8 +728,9 @@ def get_common_directories():
                 
                 if vol.is_dir():
                     try:
-                        # Verify we can access it by trying to list contents
-                        list(vol.iterdir())
+                        # Verify we can access it by reading its first entry
+                        with os.scandir(vol) as it:
+                            next(it, None)
                         # Add external drive with a clear label
                         vol_name = vol.name
                         # Check if it's the main external drive (Drive)
@@ -621,7 +746,10 @@ def get_common_directories():
             print(f"Error listing volumes: {e}")
             pass
     
-    return jsonify({"success": True, "directories": common_dirs})
+    data = {"success": True, "directories": common_dirs}
+    _common_dirs_cache["at"] = now
+    _common_dirs_cache["data"] = data
+    return jsonify(data)
 
 
 if __name__ == '__main__':
@@ -637,5 +765,12 @@ if __name__ == '__main__':
     print(f"🌐 Network access: http://{host}:{port}")
     print(f"Press Ctrl+C to stop\n")
     
-    app.run(host=host, port=port, debug=True, threaded=True)
+    if os.environ.get('FLASK_DEV'):
+        # Development server with the reloader and debugger, for local iteration
+        app.run(host=host, port=port, debug=True, threaded=True)
+    else:
+        from waitress import serve
+        app.debug = False
+        # Open /api/events streams hold up to MAX_EVENT_STREAMS threads; the rest serve requests
+        serve(app, host=host, port=port, threads=SERVER_THREADS, connection_limit=200)
 